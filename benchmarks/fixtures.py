@@ -0,0 +1,83 @@
+"""Deterministic save states for the benchmark suite.
+
+Each fixture starts from ``main.default_game_state()`` so it picks up new
+keys automatically, then layers on the progress typical of that stage.
+"""
+
+FIXTURE_NAMES = ("fresh", "mid", "maxed")
+
+
+def _levels(upgrades, fraction=1.0, level=None):
+    count = int(round(len(upgrades) * fraction))
+    entries = []
+    for upg in upgrades[:count]:
+        max_level = upg.get("max_level", 1)
+        entries.append({"id": upg["id"], "level": min(max_level, level or max_level)})
+    return entries
+
+
+def build_fixture(main, name):
+    state = main.default_game_state()
+    if name == "fresh":
+        return state
+    rpg = state["rpg_data"]
+    if name == "mid":
+        owned = main.UPGRADES[: len(main.UPGRADES) // 2]
+        state.update(
+            {
+                "layer": 1,
+                "money": 2.5e9,
+                "money_since_reset": 8.0e9,
+                "inspiration": 1_200,
+                "upgrades_unlocked": True,
+                "auto_work_unlocked": True,
+                "inspiration_unlocked": True,
+                "motivation_unlocked": True,
+                "motivation": 50,
+                "inspiration_resets": 6,
+                "stability_resets": 12,
+                "stability_currency": 340,
+                "play_time": 5_400.0,
+                "owned": [u["id"] for u in owned],
+                "upgrade_levels": {u["id"]: min(3, u.get("max_level", 1)) for u in owned},
+                "inspiration_upgrades": _levels(main.INSPIRE_UPGRADES, 0.5, level=2),
+            }
+        )
+        rpg.update({"floor": 6, "max_floor": 6, "level": 4})
+        return state
+    if name == "maxed":
+        state.update(
+            {
+                "layer": 2,
+                "money": 1.0e250,
+                "money_since_reset": 4.0e250,
+                "inspiration": 1.0e40,
+                "concepts": 1.0e25,
+                "upgrades_unlocked": True,
+                "auto_work_unlocked": True,
+                "auto_buyer_unlocked": True,
+                "inspiration_unlocked": True,
+                "concepts_unlocked": True,
+                "motivation_unlocked": True,
+                "motivation": 100,
+                "inspiration_resets": 120,
+                "concept_resets": 40,
+                "stability_resets": 400,
+                "stability_currency": 1.0e9,
+                "automation_currency": 1.0e6,
+                "automation_auto_tiers": 3,
+                "rpg_unlocked": True,
+                "breach_key_obtained": True,
+                "breach_door_open": True,
+                "breach_door_manifested": True,
+                "play_time": 360_000.0,
+                "owned": [u["id"] for u in main.UPGRADES],
+                "upgrade_levels": {u["id"]: u.get("max_level", 1) for u in main.UPGRADES},
+                "inspiration_upgrades": _levels(main.INSPIRE_UPGRADES),
+                "concept_upgrades": _levels(main.CONCEPT_UPGRADES),
+                "automation_upgrades": _levels(main.AUTOMATION_UPGRADES),
+            }
+        )
+        rpg.update({"floor": 40, "max_floor": 40, "level": 30})
+        return state
+    raise ValueError(f"unknown fixture {name!r}; expected one of {FIXTURE_NAMES}")
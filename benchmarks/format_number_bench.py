@@ -0,0 +1,89 @@
+"""Micro-benchmark for config.format_number.
+
+Compares the previous suffix-scanning formatter with the exponent-indexed
+one for every scientific threshold option, once with distinct values
+(memo misses) and once with a frame's worth of repeated values (memo hits).
+
+    python benchmarks/format_number_bench.py
+"""
+import math
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+
+
+def legacy_format_number(n):
+    neg = n < 0
+    n = abs(n)
+    threshold = max(3, int(config.SCIENTIFIC_THRESHOLD_EXPONENT))
+    if n >= 1000:
+        if isinstance(n, int):
+            exponent = len(str(n)) - 1
+        else:
+            try:
+                exponent = int(math.log10(n)) if n > 0 else 0
+            except (ValueError, OverflowError):
+                exponent = threshold
+        if exponent >= threshold:
+            mantissa = n / 10**exponent
+            s = f"{mantissa:.2f}".rstrip("0").rstrip(".")
+            out = f"{s}e{exponent}"
+            return f"-{out}" if neg else out
+    for value, symbol in config.SHORT_SCALE_SUFFIXES:
+        exp_value = int(round(math.log10(value))) if value > 0 else 0
+        if exp_value >= threshold:
+            continue
+        if n >= value:
+            s = f"{n / value:.2f}".rstrip("0").rstrip(".")
+            out = f"{s}{symbol}"
+            return f"-{out}" if neg else out
+    s = f"{n:.2f}".rstrip("0").rstrip(".")
+    return f"-{s}" if neg else s
+
+
+def sample_values(count, seed=7):
+    rng = random.Random(seed)
+    return [10 ** rng.uniform(0, 306) for _ in range(count)]
+
+
+def time_per_call(fn, values, repeat=5):
+    def run():
+        for v in values:
+            fn(v)
+
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    return best / len(values) * 1e6
+
+
+def main():
+    cold = sample_values(20000)
+    warm = sample_values(40, seed=11) * 500
+    print(f"{'threshold':>9}  {'values':>6}  {'legacy us':>10}  {'fast us':>8}  {'speedup':>7}")
+    original = config.SCIENTIFIC_THRESHOLD_EXPONENT
+    try:
+        for threshold in config.SCIENTIFIC_THRESHOLD_OPTIONS:
+            config.SCIENTIFIC_THRESHOLD_EXPONENT = threshold
+            for label, values in (("cold", cold), ("warm", warm)):
+                for v in values:
+                    assert config.format_number(v) == legacy_format_number(v), v
+                config._FORMAT_MEMO.clear()
+                if label == "warm":
+                    for v in values:
+                        config.format_number(v)
+                legacy = time_per_call(legacy_format_number, values)
+                fast = time_per_call(config.format_number, values)
+                print(
+                    f"{threshold:>9}  {label:>6}  {legacy:>10.2f}  {fast:>8.2f}  {legacy / fast:>6.1f}x"
+                )
+    finally:
+        config.SCIENTIFIC_THRESHOLD_EXPONENT = original
+        config._FORMAT_MEMO.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Time the economy and render hot paths against fixture saves.
+
+Runs without a TTY (the terminal size comes from COLUMNS/LINES, defaulting
+to the game's target layout) and writes saves to a temporary directory.
+
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --fixture maxed --only tree,boxed
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("COLUMNS", "200")
+os.environ.setdefault("LINES", "55")
+
+import bignum  # noqa: E402
+import main  # noqa: E402
+from fixtures import FIXTURE_NAMES, build_fixture  # noqa: E402
+
+
+def _save_roundtrip():
+    main.save_game()
+    main.wait_for_save_writer()
+
+
+def _rpg_floor():
+    rpg = main.game["rpg_data"]
+    rpg["floor"] = rpg.get("max_floor", 1)
+    main.generate_rpg_floor(rpg)
+
+
+def _late_game_sweep():
+    """Gains and next-point predictions for balances from 1e300 to 1e1000.
+
+    Doubles as a check: every prediction must be a positive amount.
+    """
+    saved = main.game["money_since_reset"]
+    for exponent in range(300, 1001, 10):
+        money = bignum.from_log10(exponent + 0.5)
+        main.game["money_since_reset"] = money
+        main.calculate_inspiration(money)
+        main.calculate_concepts(money)
+        for predict in (main.predict_next_inspiration_point, main.predict_next_concept_point):
+            remaining = predict()
+            if not 0 < remaining < money:
+                raise AssertionError(f"{predict.__name__} at 1e{exponent}: {remaining!r}")
+    main.game["money_since_reset"] = saved
+
+
+BENCHMARKS = [
+    ("compute_gain_and_delay", lambda: main.compute_gain_and_delay(auto=True)),
+    ("calculate_inspiration", lambda: main.calculate_inspiration(main.game["money_since_reset"])),
+    ("calculate_concepts", lambda: main.calculate_concepts(main.game["money_since_reset"])),
+    ("predict_next_inspiration_point", main.predict_next_inspiration_point),
+    ("predict_next_concept_point", main.predict_next_concept_point),
+    ("late_game_sweep", _late_game_sweep),
+    (
+        "build_tree_lines",
+        lambda: main.build_tree_lines(main.INSPIRE_UPGRADES, main.get_inspire_info, "insp_page"),
+    ),
+    (
+        "boxed_lines",
+        lambda: main.boxed_lines(BOX_SAMPLE, title=" Benchmark ", pad_top=1, pad_bottom=1),
+    ),
+    ("render_desk_table", main.render_desk_table),
+    ("save_game", _save_roundtrip),
+    ("load_game", main.load_game),
+    ("generate_rpg_floor", _rpg_floor),
+]
+
+BOX_SAMPLE = [f"\033[36mRow {i:02d}\033[0m  " + "·" * (i % 40) for i in range(40)]
+
+
+def load_fixture(name):
+    main.game.clear()
+    main.game.update(build_fixture(main, name))
+    main.ensure_rpg_state()
+    main.apply_inspiration_effects()
+
+
+def measure(fn, min_time, max_runs):
+    """Call ``fn`` until ``min_time`` has elapsed; return per-call seconds."""
+    fn()
+    samples = []
+    clock = time.perf_counter
+    deadline = clock() + min_time
+    while len(samples) < max_runs:
+        start = clock()
+        fn()
+        samples.append(clock() - start)
+        if start >= deadline:
+            break
+    return samples
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    total = sum(ordered)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return {
+        "runs": len(ordered),
+        "ops": len(ordered) / total if total else float("inf"),
+        "mean": total / len(ordered),
+        "p99": p99,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixture", action="append", choices=FIXTURE_NAMES)
+    parser.add_argument("--only", default="", help="comma-separated name substrings")
+    parser.add_argument("--min-time", type=float, default=0.25, help="seconds per benchmark")
+    parser.add_argument("--max-runs", type=int, default=20000)
+    return parser.parse_args(argv)
+
+
+def main_cli(argv=None):
+    args = parse_args(argv)
+    fixtures = args.fixture or list(FIXTURE_NAMES)
+    filters = [f.strip() for f in args.only.split(",") if f.strip()]
+    selected = [
+        (name, fn) for name, fn in BENCHMARKS if not filters or any(f in name for f in filters)
+    ]
+    header = f"{'benchmark':<30} {'fixture':<7} {'runs':>7} {'ops/sec':>12} {'mean us':>10} {'p99 us':>10}"
+    print(header)
+    print("-" * len(header))
+    with tempfile.TemporaryDirectory() as tmp:
+        main.DATA_DIR = tmp
+        main.SAVES_ENABLED = True
+        for fixture in fixtures:
+            for name, fn in selected:
+                load_fixture(fixture)
+                if name == "load_game":
+                    _save_roundtrip()
+                stats = summarize(measure(fn, args.min_time, args.max_runs))
+                print(
+                    f"{name:<30} {fixture:<7} {stats['runs']:>7} {stats['ops']:>12,.0f}"
+                    f" {stats['mean'] * 1e6:>10.1f} {stats['p99'] * 1e6:>10.1f}"
+                )
+        main.wait_for_save_writer()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,358 @@
+"""Mantissa/exponent numbers for currencies that outgrow a float.
+
+Amounts stay plain floats while they are below ``PROMOTE_AT``. Past that
+they become :class:`BigNum`, which stores ``mantissa * 10**exponent`` with
+``1 <= |mantissa| < 10`` and an integer exponent, so growth is unbounded
+while every operation stays a couple of float ops. Arithmetic on a BigNum
+hands back a plain float again as soon as the result fits, so code that
+never reaches the late game never sees one.
+"""
+from __future__ import annotations
+
+import math
+import sys
+from typing import Any
+
+PROMOTE_AT = 1e300
+PROMOTE_EXPONENT = 300
+JSON_TAG = "__bignum__"
+# Past this exponent gap the smaller operand cannot move the mantissa.
+_ADD_PRECISION = 17
+_FLOAT_MAX = sys.float_info.max
+
+
+class BigNum:
+    __slots__ = ("mantissa", "exponent")
+
+    def __init__(self, mantissa: float = 0.0, exponent: int = 0):
+        mantissa = float(mantissa)
+        exponent = int(exponent)
+        if not math.isfinite(mantissa):
+            raise ValueError("BigNum mantissa must be finite")
+        if mantissa == 0.0:
+            self.mantissa, self.exponent = 0.0, 0
+            return
+        shift = int(math.floor(math.log10(abs(mantissa))))
+        if shift:
+            mantissa /= 10.0 ** shift
+            exponent += shift
+        if abs(mantissa) >= 10.0:
+            mantissa /= 10.0
+            exponent += 1
+        self.mantissa, self.exponent = mantissa, exponent
+
+    @classmethod
+    def from_value(cls, value: Any) -> "BigNum":
+        if isinstance(value, BigNum):
+            return value
+        if isinstance(value, str):
+            return parse(value, as_big=True)
+        if isinstance(value, int) and not isinstance(value, bool) and abs(value) > PROMOTE_AT:
+            exponent = int(math.log10(abs(value)))
+            return cls(value / 10**exponent, exponent)
+        value = float(value)
+        if not math.isfinite(value):
+            raise OverflowError("cannot represent a non-finite amount")
+        if value == 0.0:
+            return cls()
+        exponent = int(math.floor(math.log10(abs(value))))
+        if exponent < -300:
+            return cls()
+        return cls(value / 10.0 ** exponent, exponent)
+
+    # -- conversions -------------------------------------------------
+    def __float__(self) -> float:
+        # Saturate instead of returning inf so float-only callers (log10,
+        # floor division, progress ratios) keep working on huge balances.
+        if self.exponent > 308:
+            return math.copysign(_FLOAT_MAX, self.mantissa)
+        if self.exponent < -320:
+            return 0.0
+        value = self.mantissa * 10.0 ** self.exponent
+        if math.isinf(value):
+            return math.copysign(_FLOAT_MAX, self.mantissa)
+        return value
+
+    def __int__(self) -> int:
+        if self.exponent <= 15:
+            return int(float(self))
+        return int(self.mantissa * 10**15) * 10 ** (self.exponent - 15)
+
+    def __round__(self, ndigits=None):
+        if self.exponent > 15:
+            return self
+        return round(float(self), ndigits)
+
+    def __floor__(self):
+        if self.exponent > 15:
+            return self
+        return math.floor(float(self))
+
+    def __ceil__(self):
+        if self.exponent > 15:
+            return self
+        return math.ceil(float(self))
+
+    def __bool__(self) -> bool:
+        return self.mantissa != 0.0
+
+    def __hash__(self) -> int:
+        if self.exponent <= 308:
+            return hash(float(self))
+        return hash((self.mantissa, self.exponent))
+
+    def __repr__(self) -> str:
+        return f"BigNum({self.mantissa!r}, {self.exponent})"
+
+    def __str__(self) -> str:
+        return f"{self.mantissa:.6g}e{self.exponent}"
+
+    def __format__(self, spec: str) -> str:
+        if self.exponent < PROMOTE_EXPONENT:
+            return format(float(self), spec)
+        return str(self)
+
+    def __copy__(self) -> "BigNum":
+        return self
+
+    def __deepcopy__(self, memo) -> "BigNum":
+        return self
+
+    def log10(self) -> float:
+        if self.mantissa <= 0:
+            raise ValueError("math domain error")
+        return math.log10(self.mantissa) + self.exponent
+
+    def to_json(self) -> dict:
+        return {JSON_TAG: [self.mantissa, self.exponent]}
+
+    # -- arithmetic --------------------------------------------------
+    def __neg__(self):
+        return BigNum(-self.mantissa, self.exponent)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return BigNum(abs(self.mantissa), self.exponent)
+
+    def __add__(self, other):
+        if not _is_number(other):
+            return NotImplemented
+        other = BigNum.from_value(other)
+        if not other.mantissa:
+            return _demote(self.mantissa, self.exponent)
+        if not self.mantissa:
+            return _demote(other.mantissa, other.exponent)
+        big, small = (self, other) if self.exponent >= other.exponent else (other, self)
+        gap = big.exponent - small.exponent
+        if gap > _ADD_PRECISION:
+            return _demote(big.mantissa, big.exponent)
+        return _demote(big.mantissa + small.mantissa / 10.0 ** gap, big.exponent)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if not _is_number(other):
+            return NotImplemented
+        return self + (-BigNum.from_value(other))
+
+    def __rsub__(self, other):
+        if not _is_number(other):
+            return NotImplemented
+        return BigNum.from_value(other) + (-self)
+
+    def __mul__(self, other):
+        if not _is_number(other):
+            return NotImplemented
+        other = BigNum.from_value(other)
+        return _demote(self.mantissa * other.mantissa, self.exponent + other.exponent)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if not _is_number(other):
+            return NotImplemented
+        other = BigNum.from_value(other)
+        if not other.mantissa:
+            raise ZeroDivisionError("division by zero")
+        return _demote(self.mantissa / other.mantissa, self.exponent - other.exponent)
+
+    def __rtruediv__(self, other):
+        if not _is_number(other):
+            return NotImplemented
+        return BigNum.from_value(other) / self
+
+    def __floordiv__(self, other):
+        result = self / other
+        return math.floor(result) if isinstance(result, float) else result
+
+    def __pow__(self, power):
+        if isinstance(power, BigNum):
+            power = float(power)
+        if not isinstance(power, (int, float)):
+            return NotImplemented
+        if not self.mantissa:
+            return 0.0 if power > 0 else 1.0
+        if self.mantissa < 0:
+            raise ValueError("BigNum only supports powers of positive values")
+        return from_log10(self.log10() * power)
+
+    # -- comparisons -------------------------------------------------
+    def _compare(self, other) -> int:
+        other = BigNum.from_value(other)
+        a, b = self, other
+        sign_a = (a.mantissa > 0) - (a.mantissa < 0)
+        sign_b = (b.mantissa > 0) - (b.mantissa < 0)
+        if sign_a != sign_b:
+            return -1 if sign_a < sign_b else 1
+        if sign_a == 0:
+            return 0
+        key_a, key_b = (a.exponent, abs(a.mantissa)), (b.exponent, abs(b.mantissa))
+        if key_a == key_b:
+            return 0
+        bigger = 1 if key_a > key_b else -1
+        return bigger * sign_a
+
+    def __eq__(self, other):
+        if not _is_number(other):
+            return NotImplemented
+        if isinstance(other, float) and not math.isfinite(other):
+            return False
+        return self._compare(other) == 0
+
+    def __lt__(self, other):
+        if not _is_number(other):
+            return NotImplemented
+        if isinstance(other, float) and math.isinf(other):
+            return other > 0
+        return self._compare(other) < 0
+
+    def __le__(self, other):
+        if not _is_number(other):
+            return NotImplemented
+        if isinstance(other, float) and math.isinf(other):
+            return other > 0
+        return self._compare(other) <= 0
+
+    def __gt__(self, other):
+        if not _is_number(other):
+            return NotImplemented
+        if isinstance(other, float) and math.isinf(other):
+            return other < 0
+        return self._compare(other) > 0
+
+    def __ge__(self, other):
+        if not _is_number(other):
+            return NotImplemented
+        if isinstance(other, float) and math.isinf(other):
+            return other < 0
+        return self._compare(other) >= 0
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (BigNum, int, float))
+
+
+def _demote(mantissa: float, exponent: int):
+    """Normalize a result, returning a float once it fits comfortably."""
+    if exponent < PROMOTE_EXPONENT - 1:
+        return mantissa * 10.0 ** exponent
+    result = BigNum(mantissa, exponent)
+    if result.exponent < PROMOTE_EXPONENT:
+        return result.mantissa * 10.0 ** result.exponent
+    return result
+
+
+def from_log10(log_value: float):
+    """Return ``10 ** log_value`` as a float or BigNum."""
+    exponent = math.floor(log_value)
+    return _demote(10.0 ** (log_value - exponent), int(exponent))
+
+
+def is_big(value) -> bool:
+    return isinstance(value, BigNum)
+
+
+def add(a, b):
+    """``a + b`` that promotes to BigNum instead of overflowing to inf."""
+    if isinstance(a, BigNum) or isinstance(b, BigNum):
+        return a + b
+    result = a + b
+    if -PROMOTE_AT < result < PROMOTE_AT:
+        return result
+    if not (math.isfinite(a) and math.isfinite(b)):
+        return result
+    return BigNum.from_value(a) + b
+
+
+def mul(a, b):
+    """``a * b`` that promotes to BigNum instead of overflowing to inf."""
+    if isinstance(a, BigNum) or isinstance(b, BigNum):
+        return a * b
+    result = a * b
+    if -PROMOTE_AT < result < PROMOTE_AT:
+        return result
+    if not (math.isfinite(a) and math.isfinite(b)):
+        return result
+    return BigNum.from_value(a) * b
+
+
+def power(base, exp):
+    """``base ** exp`` for non-negative bases, promoting past float range."""
+    if isinstance(base, BigNum):
+        return base**exp
+    try:
+        result = base**exp
+    except OverflowError:
+        return BigNum.from_value(base) ** exp
+    if isinstance(result, float) and result >= PROMOTE_AT and math.isfinite(base):
+        return BigNum.from_value(base) ** exp
+    return result
+
+
+def whole(value):
+    """``int(value)`` for floats; BigNum values are already whole numbers."""
+    if isinstance(value, BigNum):
+        return value if value.exponent > 15 else int(value)
+    return int(value)
+
+
+def log10(value) -> float:
+    if isinstance(value, BigNum):
+        return value.log10()
+    return math.log10(value)
+
+
+def log(value, base: float = math.e) -> float:
+    if isinstance(value, BigNum):
+        return value.log10() / math.log10(base)
+    return math.log(value, base)
+
+
+def parse(text: str, as_big: bool = False):
+    """Parse ``"1.5e400"``-style text produced by ``str(BigNum)``."""
+    mantissa_text, sep, exponent_text = text.strip().lower().partition("e")
+    if not sep:
+        value = float(mantissa_text)
+        return BigNum.from_value(value) if as_big else value
+    result = BigNum(float(mantissa_text), int(exponent_text))
+    return result if as_big else _demote(result.mantissa, result.exponent)
+
+
+def json_default(obj):
+    """``json.dump(default=...)`` hook that serializes BigNum values."""
+    if isinstance(obj, BigNum):
+        return obj.to_json()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_object_hook(obj: dict):
+    """``json.load(object_hook=...)`` hook that revives BigNum values."""
+    if len(obj) == 1 and JSON_TAG in obj:
+        try:
+            mantissa, exponent = obj[JSON_TAG]
+            return _demote(float(mantissa), int(exponent))
+        except (TypeError, ValueError):
+            return 0.0
+    return obj
@@ -8,6 +8,8 @@ UPGRADE_ANIM_FRAMES = {
 }
 import math
 
+from bignum import BigNum
+
 GAME_TITLE = "Mirrorwake Protocol"
 
 SCIENTIFIC_THRESHOLD_OPTIONS = [3, 33, 303]
@@ -261,6 +263,8 @@ SETTINGS_SECTIONS = [
         "items": [
             {"id": "color_theme", "type": "choice", "label": "Color theme", "choices": ["default", "mono", "high_contrast"], "key": None},
             {"id": "show_floating_hints", "type": "bool", "label": "Show floating hints", "key": None},
+            {"id": "frame_profiler", "type": "bool", "label": "Frame profiler overlay", "key": None},
+            {"id": "rpg_threat_estimate", "type": "bool", "label": "RPG threat estimate", "key": None},
         ],
     },
     {
@@ -268,6 +272,8 @@ SETTINGS_SECTIONS = [
         "label": "Gameplay",
         "items": [
             {"id": "autosave", "type": "bool", "label": "Autosave after major events", "key": None},
+            {"id": "save_format", "type": "choice", "label": "Save format", "choices": ["json", "packed"], "key": None},
+            {"id": "export_save_json", "type": "action", "label": "Export save as JSON", "key": None},
             {"id": "export_settings", "type": "action", "label": "Export settings to file", "key": None},
             {"id": "import_settings", "type": "action", "label": "Import settings from file", "key": None},
         ],
@@ -647,7 +653,17 @@ CAFFEINE_POINT_RATE = 1
 MIN_BOX_WIDTH = 50
 BOX_MARGIN = 4
 SAVE_SLOT_COUNT = 4
+SAVE_DEBOUNCE_INTERVAL = 5.0  # seconds between coalesced autosaves
 MAIN_LOOP_MIN_DT = 0.02
+SIM_TICK_RATE = 60  # fixed simulation steps per second
+RENDER_FPS_CAP = 20  # maximum redraws per second for the main screens
+SIM_MAX_CATCHUP_STEPS = 30  # fixed steps per loop before falling back to one coarse step
+FRAME_PROFILER_WINDOW = 600  # loop iterations kept by the frame profiler
+OFFLINE_PROGRESS_MIN_SECONDS = 60  # shorter absences are not worth a catch-up pass
+OFFLINE_PROGRESS_MAX_SECONDS = 14 * 24 * 3600
+OFFLINE_PROGRESS_MAX_STEPS = 2000  # coarse steps used to cover the absence
+OFFLINE_PROGRESS_MIN_STEP = 1.0
+OFFLINE_PROGRESS_EXPIRY_TICK = 0.05  # final slice that lets the wake timer run out
 ENEMY_ANIM_DELAY = 0.35
 
 UPGRADES = [
@@ -1476,13 +1492,25 @@ LAYER2_PARTICLE_AMPLITUDE = 12
 LAYER2_PARTICLE_FREQ = 3
 
 
-def format_number(n):
-    neg = n < 0
-    n = abs(n)
+def _build_suffix_lookup(suffixes):
+    """Index the suffix covering each decimal exponent up to the largest one."""
+    by_exponent = {len(str(value)) - 1: (value, symbol) for value, symbol in suffixes}
+    lookup, best = [], None
+    for exponent in range(max(by_exponent) + 1):
+        best = by_exponent.get(exponent, best)
+        lookup.append(best)
+    return lookup
 
-    suffixes = SHORT_SCALE_SUFFIXES
 
-    threshold = max(3, int(SCIENTIFIC_THRESHOLD_EXPONENT))
+SHORT_SCALE_LOOKUP = _build_suffix_lookup(SHORT_SCALE_SUFFIXES)
+_FORMAT_MEMO = {}
+_FORMAT_MEMO_LIMIT = 4096
+
+
+def _format_scaled(n, threshold):
+    if isinstance(n, BigNum) and n.exponent >= threshold:
+        s = f"{n.mantissa:.2f}".rstrip("0").rstrip(".")
+        return f"{s}e{n.exponent}"
     if n >= 1000:
         if isinstance(n, int):
             exponent = len(str(n)) - 1
@@ -1495,20 +1523,30 @@ def format_number(n):
             base = 10 ** exponent
             mantissa = n / base if base else 0
             s = f"{mantissa:.2f}".rstrip("0").rstrip(".")
-            out = f"{s}e{exponent}"
-            return f"-{out}" if neg else out
-
-    for value, symbol in suffixes:
-        exp_value = int(round(math.log10(value))) if value > 0 else 0
-        if exp_value >= threshold:
-            continue
-        if n >= value:
+            return f"{s}e{exponent}"
+        entry = SHORT_SCALE_LOOKUP[min(exponent, len(SHORT_SCALE_LOOKUP) - 1)]
+        if entry is not None and n < entry[0]:
+            # log10 rounded up just below a power of ten; use the tier below.
+            entry = SHORT_SCALE_LOOKUP[len(str(entry[0])) - 2]
+        if entry is not None:
+            value, symbol = entry
             s = f"{n / value:.2f}".rstrip("0").rstrip(".")
-            out = f"{s}{symbol}"
-            return f"-{out}" if neg else out
+            return f"{s}{symbol}"
+    return f"{n:.2f}".rstrip("0").rstrip(".")
+
 
-    s = f"{n:.2f}".rstrip("0").rstrip(".")
-    return f"-{s}" if neg else s
+def format_number(n):
+    threshold = max(3, int(SCIENTIFIC_THRESHOLD_EXPONENT))
+    key = (n.__class__, n, threshold)
+    out = _FORMAT_MEMO.get(key)
+    if out is None:
+        out = _format_scaled(abs(n), threshold)
+        if n < 0:
+            out = f"-{out}"
+        if len(_FORMAT_MEMO) >= _FORMAT_MEMO_LIMIT:
+            _FORMAT_MEMO.clear()
+        _FORMAT_MEMO[key] = out
+    return out
 
 
 AUTO_BALANCE_UPGRADES = True
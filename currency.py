@@ -2,24 +2,27 @@ from __future__ import annotations
 
 from typing import Any, MutableMapping
 
+from bignum import BigNum, add
 from config import AUTOMATION_REWARD_RATIO
 
 GameState = MutableMapping[str, Any]
 
 
-def _normalize_amount(value: Any) -> int:
+def _normalize_amount(value: Any) -> int | BigNum:
+    if isinstance(value, BigNum):
+        return value if value > 0 else 0
     try:
         return max(0, int(round(float(value))))
     except Exception:
         return 0
 
 
-def grant_stability_currency(game_state: GameState, amount: Any) -> int:
+def grant_stability_currency(game_state: GameState, amount: Any) -> int | BigNum:
     delta = _normalize_amount(amount)
     if delta <= 0:
         return 0
     current = _normalize_amount(game_state.get("stability_currency", 0))
-    game_state["stability_currency"] = current + delta
+    game_state["stability_currency"] = add(current, delta)
     return delta
 
 
@@ -27,7 +30,7 @@ def grant_automation_currency(
     game_state: GameState,
     collapse_reward: Any,
     ratio: float = AUTOMATION_REWARD_RATIO,
-) -> int:
+) -> int | BigNum:
     base = _normalize_amount(collapse_reward)
     if base <= 0 or ratio <= 0:
         return 0
@@ -35,5 +38,5 @@ def grant_automation_currency(
     if delta <= 0:
         return 0
     current = _normalize_amount(game_state.get("automation_currency", 0))
-    game_state["automation_currency"] = current + delta
+    game_state["automation_currency"] = add(current, delta)
     return delta
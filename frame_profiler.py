@@ -0,0 +1,140 @@
+"""Per-phase timings for the main loop.
+
+Phases nest: time spent in an inner phase (a save inside the sim tick, the
+TTY write inside a render) is charged to the inner phase only. A phase
+only records a sample on loop iterations where it ran, so render and io
+figures are per drawn frame and fps counts frames that were drawn.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from bisect import bisect_right
+from collections import deque
+from contextlib import contextmanager
+
+PHASES = ("input", "sim", "render", "io", "save")
+HISTOGRAM_BOUNDS_MS = (0.5, 1, 2, 4, 8, 16, 33, 66, 133, 250, 500, 1000)
+
+
+def _bucket_label(idx: int) -> str:
+    if idx < len(HISTOGRAM_BOUNDS_MS):
+        return f"<{HISTOGRAM_BOUNDS_MS[idx]}ms"
+    return f">={HISTOGRAM_BOUNDS_MS[-1]}ms"
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class FrameProfiler:
+    def __init__(self, window: int = 600):
+        self.enabled = False
+        self.window = max(1, int(window))
+        self.samples = {phase: deque(maxlen=self.window) for phase in PHASES}
+        self.frame_stamps = deque(maxlen=self.window)
+        self.frames = 0
+        self.started = time.time()
+        self._current = {}
+        self._stack = []
+        self._in_frame = False
+
+    def reset(self):
+        self.__init__(self.window)
+
+    def set_enabled(self, enabled: bool):
+        enabled = bool(enabled)
+        if enabled and not self.enabled:
+            self.reset()
+        self.enabled = enabled
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._current = {}
+        self._stack = []
+        self._in_frame = True
+
+    def end_frame(self):
+        if not self._in_frame:
+            return
+        self._in_frame = False
+        for phase, seconds in self._current.items():
+            self.samples.setdefault(phase, deque(maxlen=self.window)).append(seconds * 1000.0)
+        if "render" in self._current:
+            self.frame_stamps.append(time.perf_counter())
+            self.frames += 1
+
+    @contextmanager
+    def phase(self, name: str):
+        if not self._in_frame:
+            yield
+            return
+        start = time.perf_counter()
+        self._stack.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self._stack.pop()
+            self._current[name] = self._current.get(name, 0.0) + max(0.0, elapsed - nested)
+            if self._stack:
+                self._stack[-1] += elapsed
+
+    def fps(self) -> float:
+        if len(self.frame_stamps) < 2:
+            return 0.0
+        span = self.frame_stamps[-1] - self.frame_stamps[0]
+        return (len(self.frame_stamps) - 1) / span if span > 0 else 0.0
+
+    def histogram(self, phase: str) -> dict:
+        counts = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        for ms in self.samples.get(phase, ()):
+            counts[bisect_right(HISTOGRAM_BOUNDS_MS, ms)] += 1
+        return {_bucket_label(idx): count for idx, count in enumerate(counts)}
+
+    def mean_ms(self, phase: str) -> float:
+        values = self.samples.get(phase)
+        return sum(values) / len(values) if values else 0.0
+
+    def overlay_line(self) -> str:
+        sim = self.mean_ms("sim") + self.mean_ms("input")
+        io = self.mean_ms("io") + self.mean_ms("save")
+        return (
+            f"[profiler] sim {sim:5.2f}ms  render {self.mean_ms('render'):5.2f}ms"
+            f"  io {io:5.2f}ms  {self.fps():5.1f} fps"
+        )
+
+    def summary(self) -> dict:
+        phases = {}
+        for phase in PHASES:
+            ordered = sorted(self.samples[phase])
+            phases[phase] = {
+                "mean_ms": self.mean_ms(phase),
+                "p50_ms": _percentile(ordered, 0.50),
+                "p99_ms": _percentile(ordered, 0.99),
+                "max_ms": ordered[-1] if ordered else 0.0,
+                "histogram": self.histogram(phase),
+            }
+        return {
+            "started": self.started,
+            "ended": time.time(),
+            "frames": self.frames,
+            "window": self.window,
+            "fps": self.fps(),
+            "phases": phases,
+        }
+
+    def dump(self, path: str) -> bool:
+        if not self.frames:
+            return False
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as handle:
+                json.dump(self.summary(), handle, indent=2)
+            return True
+        except OSError:
+            return False
@@ -0,0 +1,374 @@
+"""Typed containers for the save state.
+
+``game`` used to be a plain dict. These records keep every schema field in
+a ``__slots__`` attribute so hot code can read ``game.money`` directly,
+while the mapping interface (``game["money"]``, ``.get``, ``.setdefault``,
+``.update`` ...) keeps older call sites working unchanged. A field that
+was never assigned behaves like a missing dict key, and keys outside the
+schema (scratch values such as ``insp_page_pages``) live in a side dict.
+"""
+from __future__ import annotations
+
+import copy
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Union
+
+import room_grid
+from bignum import BigNum
+
+Amount = Union[float, int, BigNum]
+
+SAVE_VERSION = 2
+
+
+class StateRecord(MutableMapping):
+    __slots__ = ("_extra",)
+    NESTED: dict = {}
+    _FIELDS: tuple = ()
+    _FIELD_SET: frozenset = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._FIELDS = tuple(cls.__dict__.get("__slots__", ()))
+        cls._FIELD_SET = frozenset(cls._FIELDS)
+        clashes = {name for name in cls._FIELDS if hasattr(MutableMapping, name)}
+        if clashes:
+            raise TypeError(f"{cls.__name__} fields shadow mapping methods: {sorted(clashes)}")
+
+    def __init__(self, data=(), **kwargs):
+        self._extra = {}
+        self.update(data, **kwargs)
+
+    # -- mapping protocol --------------------------------------------
+    def __getitem__(self, key):
+        if key in self._FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        if key in self._FIELD_SET:
+            record_cls = self.NESTED.get(key)
+            if record_cls is not None and not isinstance(value, record_cls) and isinstance(value, Mapping):
+                value = record_cls(value)
+            setattr(self, key, value)
+        else:
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self._FIELD_SET:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        else:
+            del self._extra[key]
+
+    def __iter__(self):
+        for name in self._FIELDS:
+            if hasattr(self, name):
+                yield name
+        yield from list(self._extra)
+
+    def __len__(self):
+        return sum(1 for name in self._FIELDS if hasattr(self, name)) + len(self._extra)
+
+    def __bool__(self):
+        return bool(self._extra) or any(hasattr(self, name) for name in self._FIELDS)
+
+    def __contains__(self, key):
+        if key in self._FIELD_SET:
+            return hasattr(self, key)
+        return key in self._extra
+
+    def get(self, key, default=None):
+        if key in self._FIELD_SET:
+            return getattr(self, key, default)
+        return self._extra.get(key, default)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def clear(self):
+        for name in self._FIELDS:
+            if hasattr(self, name):
+                delattr(self, name)
+        self._extra.clear()
+
+    def copy(self):
+        return type(self)(self)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        clone = type(self)()
+        memo[id(self)] = clone
+        for key, value in self.items():
+            clone[key] = copy.deepcopy(value, memo)
+        return clone
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self._extra = {}
+        self.update(state)
+
+    # -- serialization -----------------------------------------------
+    def to_dict(self) -> dict:
+        """Plain nested dict/list copy, ready for ``json.dump``."""
+        return {key: to_plain(value) for key, value in self.items()}
+
+
+def to_plain(value):
+    if isinstance(value, StateRecord):
+        return value.to_dict()
+    if isinstance(value, Mapping):
+        return {key: to_plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_plain(item) for item in value]
+    return value
+
+
+class EscapeMachineState(StateRecord):
+    unlocked: bool
+    components: list
+    ready: bool
+    applied: bool
+    spark_bank: int
+
+    __slots__ = tuple(__annotations__)
+
+
+class ChallengeState(StateRecord):
+    active_id: Any
+    baseline: dict
+    started_at: float
+    event_progress: dict
+
+    __slots__ = tuple(__annotations__)
+
+
+class RpgState(StateRecord):
+    # "def" (defense) is not a valid attribute name and stays a mapping key.
+    hp: int
+    max_hp: int
+    atk: int
+    xp: int
+    level: int
+    gold: int
+    floor: int
+    max_floor: int
+    player_pos: Any
+    map: list
+    state: str
+    current_enemy: Any
+    inventory: dict
+    relics: list
+    log: list
+    gold_bonus: float
+    gear_atk_bonus: int
+    gear_def_bonus: int
+    gear_trinket_bonus: dict
+    floor_theme: Any
+    theme_ambient_next: float
+    shop_pending_item: Any
+    aura: str
+    shop_owned: list
+    shop_stock: list
+    ng_plus: int
+    maze_variant: Any
+    pending_variant: Any
+    maze_anim_start: float
+    maze_anim_until: float
+    transition_layout: Any
+    transition_center: Any
+    transition_sequence: list
+    transition_total_cells: int
+    transition_reveal: int
+    transition_variant: Any
+    transition_step_time: float
+    transition_last_step: float
+    event: Any
+    floor_modifier: Any
+    floor_modifier_floor: int
+    boss_rewards: list
+    stairs_prompted: bool
+    shop_purchases_this_floor: int
+    secret_origin: Any
+    secret_payload_active: Any
+    browser_bonus: dict
+    gear: dict
+    enemy_anim: Any
+    shop_locked_first_run: bool
+    seed: int
+    rng_counters: dict
+
+    __slots__ = tuple(__annotations__)
+
+    # Floor layouts are saved as compact grids (see room_grid) and rebuilt
+    # into room dicts as they are assigned back.
+    GRID_FIELDS = frozenset({"map", "transition_layout"})
+
+    def __setitem__(self, key, value):
+        if key in self.GRID_FIELDS:
+            value = room_grid.unpack(value)
+        elif key == "secret_origin":
+            value = room_grid.unpack_origin(value)
+        super().__setitem__(key, value)
+
+    def to_dict(self) -> dict:
+        data = {}
+        for key, value in self.items():
+            if key in self.GRID_FIELDS:
+                value = room_grid.pack(value)
+            elif key == "secret_origin":
+                value = room_grid.pack_origin(value)
+            data[key] = to_plain(value)
+        return data
+
+
+class GameState(StateRecord):
+    layer: int
+    money: Amount
+    money_since_reset: Amount
+    fatigue: int
+    inspiration: Amount
+    concepts: Amount
+    motivation: int
+    motivation_unlocked: bool
+    motivation_cap_bonus: int
+    motivation_strength_mult: float
+    owned: list
+    upgrade_levels: dict
+    auto_work_unlocked: bool
+    auto_buyer_unlocked: bool
+    inspiration_unlocked: bool
+    concepts_unlocked: bool
+    inspiration_upgrades: list
+    concept_upgrades: list
+    automation_upgrades: list
+    work_delay_multiplier: float
+    money_mult: float
+    manual_tap_counter: int
+    last_manual_press_ts: float
+    hold_tip_shown: bool
+    scientific_threshold_exp: int
+    insp_page: int
+    concept_page: int
+    pulses: int
+    veils: int
+    sigils: int
+    knowledge: dict
+    upgrades_unlocked: bool
+    inspiration_resets: int
+    intro_played: bool
+    concept_resets: int
+    stability_currency: Amount
+    automation_currency: Amount
+    stability_resets: int
+    stability_manual_resets: int
+    wake_timer: int
+    wake_timer_cap: int
+    wake_timer_infinite: bool
+    wake_timer_locked: bool
+    wake_timer_upgrades: dict
+    wake_timer_notified: bool
+    needs_stability_reset: bool
+    play_time: float
+    last_save_timestamp: float
+    resonance_val: int
+    resonance_target: float
+    resonance_drift_dir: int
+    breach_key_obtained: bool
+    breach_door_open: bool
+    breach_door_manifested: bool
+    settings_disable_steam: bool
+    settings_show_signal_debug: bool
+    settings_notice: str
+    settings_notice_until: float
+    settings_cursor: int
+    rpg_unlocked: bool
+    rpg_data: RpgState
+    rpg_view: str
+    rpg_icon_index: int
+    rpg_desktop_hint: str
+    rpg_hint_until: float
+    signal_multiplier: float
+    time_progress: float
+    time_velocity: float
+    time_reward_multiplier: float
+    browser_tokens: int
+    browser_unlocks: list
+    browser_notice: str
+    browser_notice_until: float
+    browser_cycles: int
+    challenges_feature_unlocked: bool
+    challenge_intro_seen: bool
+    challenge_state: ChallengeState
+    challenge_cursor: int
+    challenge_page: int
+    challenges_completed: list
+    guide_cursor: int
+    guide_unlocked: bool
+    guide_seen_topics: list
+    guide_unread_topics: list
+    guide_has_new: bool
+    rpg_tutorial_shown: bool
+    challenge_instability_installed: bool
+    automation_page: int
+    automation_delay_mult: float
+    automation_gain_mult: float
+    automation_synergy_mult: float
+    _challenge_backup: Any
+    challenge_run_active: bool
+    challenge_run_id: Any
+    quick_travel_target: str
+    escape_machine_unlocked: bool
+    escape_machine_ready: bool
+    escape_machine: EscapeMachineState
+    escape_multiplier: float
+    mirror_reality_active: bool
+    keybinds: dict
+    settings: dict
+    automation_auto_tiers: int
+    color_theme: str
+    easter_egg_flags: dict
+    last_inspiration_reset_time: float
+    manual_work_burst: int
+    manual_work_last_time: float
+    mystery_revealed: bool
+    resonance_repick_cooldown: float
+    time_stratum: int
+    upgrade_page: int
+    save_version: int
+    save_migrations: list
+
+    __slots__ = tuple(__annotations__)
+
+    NESTED = {
+        "rpg_data": RpgState,
+        "challenge_state": ChallengeState,
+        "escape_machine": EscapeMachineState,
+    }
+
+    def to_payload(self) -> dict:
+        """Serialize for a save file, stamped with the current schema version."""
+        payload = self.to_dict()
+        payload["save_version"] = SAVE_VERSION
+        return payload
+
+    def load_payload(self, payload: Mapping) -> "GameState":
+        """Replace the contents with a deserialized save payload."""
+        self.clear()
+        self.update(payload)
+        self.save_version = SAVE_VERSION
+        return self
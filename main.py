@@ -5,11 +5,7 @@ use the rendering utilities without ordering issues.
 """
 import json, os, time, sys, threading, shutil, math, select, random, textwrap, subprocess, re, traceback, copy
 from collections import deque
-
-try:
-    from wcwidth import wcswidth as _wcwidth
-except ImportError:
-    _wcwidth = None
+from collections.abc import MutableMapping
 
 msvcrt = None
 if os.name == "nt":
@@ -47,7 +43,20 @@ from ascii_art import (
     BREACH_DOOR_UNLOCK_FRAMES,
     EVENT_ANIMATIONS,
 )
+import bignum
+import combat_odds
 import config
+import save_codec
+from frame_profiler import FrameProfiler
+from game_state import SAVE_VERSION, GameState
+from text_layout import (
+    ANSI_ESCAPE,
+    ansi_center,
+    ansi_visible_slice,
+    pad_visible_line,
+    visible_len,
+    wrap_visible_text,
+)
 from config import (
     BASE_MONEY_GAIN,
     BASE_WORK_DELAY,
@@ -66,7 +75,17 @@ from config import (
     MAX_MOTIVATION_MULT,
     MOTIVATION_REGEN_RATE,
     SAVE_SLOT_COUNT,
+    SAVE_DEBOUNCE_INTERVAL,
     MAIN_LOOP_MIN_DT,
+    SIM_TICK_RATE,
+    RENDER_FPS_CAP,
+    SIM_MAX_CATCHUP_STEPS,
+    FRAME_PROFILER_WINDOW,
+    OFFLINE_PROGRESS_MIN_SECONDS,
+    OFFLINE_PROGRESS_MAX_SECONDS,
+    OFFLINE_PROGRESS_MAX_STEPS,
+    OFFLINE_PROGRESS_MIN_STEP,
+    OFFLINE_PROGRESS_EXPIRY_TICK,
     ENEMY_ANIM_DELAY,
     BORDERS,
     GAME_TITLE,
@@ -163,6 +182,10 @@ if not CHALLENGE_GROUPS:
     CHALLENGE_GROUPS = ["Trials"]
 EVENT_GOAL_TYPES = {"phase_lock_completion"}
 AUTOMATION_UPGRADE_INDEX = {u.get("id"): i for i, u in enumerate(AUTOMATION_UPGRADES)}
+INSPIRE_UPGRADE_BY_ID = {u["id"]: u for u in INSPIRE_UPGRADES}
+CONCEPT_UPGRADE_BY_ID = {u["id"]: u for u in CONCEPT_UPGRADES}
+AUTOMATION_UPGRADE_BY_ID = {u["id"]: u for u in AUTOMATION_UPGRADES}
+UPGRADE_BY_ID = {u["id"]: u for u in UPGRADES}
 AUTO_BUYER_TARGET_ORDER = [
     u.get("id")
     for u in AUTOMATION_UPGRADES
@@ -223,7 +246,6 @@ os.makedirs(DATA_DIR, exist_ok=True)
 LEGACY_SAVE_PATH = os.path.join(DATA_DIR, "save.json")
 ACTIVE_SLOT_INDEX = 2
 
-ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
 RESET_SEQ = getattr(Style, "RESET_ALL", "\x1b[0m")
 
 TERMINAL_TARGET_COLS = 200
@@ -470,6 +492,8 @@ def open_settings_menu(game):
                         export_settings(game)
                     elif sid == "import_settings":
                         import_settings(game)
+                    elif sid == "export_save_json":
+                        export_save_json()
                 continue
 
 
@@ -539,9 +563,50 @@ def default_rpg_data():
         "secret_origin": None,
         "secret_payload_active": None,
         "browser_bonus": {"max_hp": 0, "atk": 0, "def": 0, "gold": 0},
+        "seed": new_rpg_seed(),
+        "rng_counters": {},
     }
 
 
+def new_rpg_seed():
+    return random.getrandbits(32)
+
+
+def rpg_floor_rng(rpg, floor, purpose):
+    """RNG for one layout decision; a pure function of (seed, NG+ cycle, floor).
+
+    Regenerating a floor from the same run seed reproduces it exactly, no
+    matter how many fights or chests happened in between.
+    """
+    seed = rpg.get("seed")
+    if not isinstance(seed, int):
+        seed = rpg["seed"] = new_rpg_seed()
+    return random.Random(f"{seed}:{rpg.get('ng_plus', 0)}:{floor}:{purpose}")
+
+
+def rpg_rng(rpg, stream):
+    """RNG for the next draw on a sequential stream ("loot" or "combat").
+
+    Each call advances that stream's counter in ``rng_counters``, so a save
+    resumes the stream exactly where it left off.
+    """
+    seed = rpg.get("seed")
+    if not isinstance(seed, int):
+        seed = rpg["seed"] = new_rpg_seed()
+    counters = rpg.get("rng_counters")
+    if not isinstance(counters, dict):
+        counters = rpg["rng_counters"] = {}
+    draw = counters.get(stream, 0)
+    counters[stream] = draw + 1
+    return random.Random(f"{seed}:{stream}:{draw}")
+
+
+def rpg_room_rng(rpg):
+    """Roster RNG for the room under the player, fixed per (seed, floor, cell)."""
+    y, x = rpg.get("player_pos") or (0, 0)
+    return rpg_floor_rng(rpg, rpg.get("floor", 1), f"enemy:{y}:{x}")
+
+
 def default_challenge_state():
     return {
         "active_id": None,
@@ -552,7 +617,9 @@ def default_challenge_state():
 
 
 def challenge_state_data():
-    state = game.setdefault("challenge_state", default_challenge_state())
+    state = game.get("challenge_state")
+    if state is None:
+        state = game.setdefault("challenge_state", default_challenge_state())
     baseline = state.get("baseline")
     if not isinstance(baseline, dict):
         baseline = {}
@@ -615,13 +682,13 @@ def get_challenge_modifier(key, default=None):
 def auto_work_allowed():
     if get_challenge_modifier("disable_auto_work", False):
         return False
-    return bool(game.get("auto_work_unlocked", False))
+    return bool(game.auto_work_unlocked)
 
 
 def auto_buyer_allowed():
     if get_challenge_modifier("disable_auto_buyer", False):
         return False
-    return bool(game.get("auto_buyer_unlocked", False))
+    return bool(game.auto_buyer_unlocked)
 
 
 def automation_online():
@@ -747,7 +814,7 @@ def restore_pre_challenge_state():
     game["challenge_run_id"] = None
     if not isinstance(backup, dict):
         return False
-    current_knowledge = game.get("knowledge") if isinstance(game, dict) else None
+    current_knowledge = game.get("knowledge")
     if isinstance(current_knowledge, dict):
         stored = backup.setdefault("knowledge", {})
         if isinstance(stored, dict):
@@ -992,13 +1059,30 @@ def forfeit_active_challenge():
     return True
 
 
-def slot_save_path(idx):
+def slot_save_paths(idx):
+    """Every file slot ``idx`` may live in, one per save format."""
     idx = max(0, min(SAVE_SLOT_COUNT - 1, int(idx)))
-    return os.path.join(DATA_DIR, f"save_slot_{idx + 1}.json")
+    stem = os.path.join(DATA_DIR, f"save_slot_{idx + 1}")
+    return [stem + save_codec.extension(fmt) for fmt in save_codec.FORMATS]
+
 
+def slot_save_path(idx, fmt=None):
+    """File for slot ``idx`` written as ``fmt``.
 
-def current_save_path():
-    return slot_save_path(ACTIVE_SLOT_INDEX)
+    Without a format this is the slot's file on disk (the newest, should a
+    format switch have left both), falling back to the JSON name.
+    """
+    paths = slot_save_paths(idx)
+    if fmt is not None:
+        return paths[save_codec.FORMATS.index(save_codec.normalize_format(fmt))]
+    existing = [path for path in paths if os.path.exists(path)]
+    if not existing:
+        return paths[0]
+    return max(existing, key=os.path.getmtime)
+
+
+def current_save_path(fmt=None):
+    return slot_save_path(ACTIVE_SLOT_INDEX, fmt)
 
 
 def default_game_state():
@@ -1042,7 +1126,7 @@ def default_game_state():
         "automation_currency": 0.0,
         "stability_resets": 0,
         "stability_manual_resets": 0,
-            "wake_timer": WAKE_TIMER_START,
+        "wake_timer": WAKE_TIMER_START,
         "wake_timer_cap": WAKE_TIMER_START,
         "wake_timer_infinite": False,
         "wake_timer_locked": False,
@@ -1105,18 +1189,30 @@ def default_game_state():
         "mirror_reality_active": False,
         # Persisted settings and keybindings
         "keybinds": DEFAULT_KEYBINDS.copy(),
-        "settings": {
-            "auto_fullscreen": getattr(config, "AUTO_FULLSCREEN", False),
-            "escape_mode": getattr(config, "ESCAPE_MODE", True),
-            "beeps": True,
-            "color_theme": "default",
-            "show_floating_hints": True,
-            "autosave": True,
-        },
+        "settings": default_settings(),
+        "time_stratum": 0,
+        "automation_auto_tiers": 0,
+        "save_migrations": [],
+    }
+
+
+def default_settings():
+    return {
+        "auto_fullscreen": getattr(config, "AUTO_FULLSCREEN", False),
+        "escape_mode": getattr(config, "ESCAPE_MODE", True),
+        "beeps": True,
+        "color_theme": "default",
+        "show_floating_hints": True,
+        "autosave": True,
+        "frame_profiler": False,
+        "rpg_threat_estimate": False,
+        "save_format": save_codec.DEFAULT_FORMAT,
     }
 
 
 last_render, last_size = "", (0, 0)
+last_frame_lines = []
+FRAME_PROFILER = FrameProfiler(FRAME_PROFILER_WINDOW)
 work_timer, KEY_PRESSED, running = 0.0, None, True
 steam = []
 steam_last_update = time.time()
@@ -1124,8 +1220,12 @@ view_offset_x = 0
 view_offset_y = 0
 last_manual_time = 0.0
 listener_enabled = True
+KEY_QUEUE_MAX = 8
+KEY_LISTENER_IDLE_TIMEOUT = 0.25
+KEY_QUEUE = deque(maxlen=KEY_QUEUE_MAX)
+_KEY_SLOT_LOCK = threading.Lock()
 
-game = default_game_state()
+game = GameState(default_game_state())
 
 
 def guide_available():
@@ -1210,7 +1310,7 @@ def refresh_guide_topics():
     game["guide_has_new"] = True
     latest = new_titles[-1]
     set_settings_notice(f"Guide updated: {latest}. Press G to read.", duration=3.5)
-    save_game()
+    mark_save_dirty()
     return True
 
 
@@ -1230,7 +1330,7 @@ def browser_effect_totals():
 
 
 def sync_browser_bonuses(rpg):
-    if not isinstance(rpg, dict):
+    if not isinstance(rpg, MutableMapping):
         return
     desired = browser_effect_totals()
     current = rpg.get("browser_bonus") or {"max_hp": 0, "atk": 0, "def": 0, "gold": 0}
@@ -1273,7 +1373,7 @@ def rpg_base_atk(rpg):
 
 
 def enforce_ng_plus_baseline(rpg):
-    if not isinstance(rpg, dict):
+    if not isinstance(rpg, MutableMapping):
         return
     base_hp = rpg_base_hp(rpg)
     base_atk = rpg_base_atk(rpg)
@@ -1295,7 +1395,8 @@ def ensure_rpg_state():
     defaults = default_rpg_data()
     rpg = game.setdefault("rpg_data", {})
     for key, value in defaults.items():
-        if key not in rpg or rpg[key] is None:
+        current = rpg.get(key, defaults)
+        if current is defaults or (current is None and value is not None):
             rpg[key] = copy.deepcopy(value) if isinstance(value, (dict, list)) else value
     if not isinstance(rpg.get("inventory"), dict):
         rpg["inventory"] = copy.deepcopy(defaults["inventory"])
@@ -1315,7 +1416,10 @@ def ensure_rpg_state():
 
 
 def knowledge_store():
-    return game.setdefault("knowledge", {})
+    known = game.get("knowledge")
+    if known is None:
+        known = game.setdefault("knowledge", {})
+    return known
 
 
 def is_known(tag):
@@ -1348,7 +1452,7 @@ def escape_machine_state():
 
 def escape_multiplier():
     try:
-        return max(1.0, float(game.get("escape_multiplier", 1.0)))
+        return max(1.0, float(game.escape_multiplier))
     except Exception:
         return 1.0
 
@@ -1683,7 +1787,7 @@ def wait_for_any_keypress(timeout=None):
     global KEY_PRESSED
     start = time.time()
     while True:
-        if KEY_PRESSED:
+        if pump_key_queue():
             KEY_PRESSED = None
             return True
         if timeout is not None and (time.time() - start) >= timeout:
@@ -1695,7 +1799,7 @@ def get_key_with_timeout(timeout=None):
     global KEY_PRESSED
     start = time.time()
     while True:
-        if KEY_PRESSED:
+        if pump_key_queue():
             raw = KEY_PRESSED
             KEY_PRESSED = None
             return normalize_key(raw)
@@ -1783,6 +1887,8 @@ def apply_settings(game):
         esc = bool(settings.get("escape_mode", getattr(config, "ESCAPE_MODE", True)))
         setattr(config, "ESCAPE_MODE", esc)
 
+        FRAME_PROFILER.set_enabled(settings.get("frame_profiler", False))
+
         game["color_theme"] = settings.get("color_theme", game.get("color_theme", "default"))
         try:
             apply_color_theme(game.get("color_theme", "default"))
@@ -1877,6 +1983,18 @@ def export_settings(game, path=None):
         return False
 
 
+def export_save_json(path=None):
+    try:
+        if not path:
+            path = os.path.join(DATA_DIR, f"save_slot_{ACTIVE_SLOT_INDEX + 1}_export.json")
+        save_codec.export_json(snapshot_game_state(), path)
+        set_settings_notice(f"Save exported to {os.path.basename(path)}", duration=2.5)
+        return True
+    except Exception:
+        set_settings_notice("Failed to export save.", duration=2.5)
+        return False
+
+
 def import_settings(game, path=None):
     try:
         if not path:
@@ -2010,6 +2128,7 @@ def perform_machine_escape_reset():
     new_state = default_game_state()
     game.clear()
     game.update(new_state)
+    invalidate_upgrade_effects()
     game["knowledge"] = knowledge_snapshot
     game["guide_unlocked"] = guide_unlocked
     game["guide_seen_topics"] = guide_seen
@@ -2152,7 +2271,7 @@ def set_motivation(value):
         value = cap
     clamped = max(0.0, min(float(cap), float(value)))
     rounded = round(clamped + 1e-8, 1)
-    game["motivation"] = rounded
+    game.motivation = rounded
     return rounded
 
 
@@ -2407,7 +2526,7 @@ def recalc_wake_timer_state():
 
 
 def wake_timer_blocked():
-    return (not game.get("wake_timer_infinite", False)) and game.get("wake_timer", 0) <= 0
+    return (not game.wake_timer_infinite) and game.wake_timer <= 0
 
 
 def format_clock(seconds):
@@ -2463,27 +2582,62 @@ def format_currency(amount):
     return f"{CURRENCY_SYMBOL}{rendered}"
 
 
-def save_game():
-    ensure_rpg_state()
-    game["last_save_timestamp"] = time.time()
-    # Create a safe deepcopy for serialization: try deep-copy per-key and
-    # fall back to shallow copy or reference if deepcopy fails for a value.
-    payload = {}
-    for k, v in list(game.items()):
-        try:
-            payload[k] = copy.deepcopy(v)
-        except Exception:
-            try:
-                payload[k] = copy.copy(v)
-            except Exception:
-                payload[k] = v
-    target_path = current_save_path()
+_SAVE_DIRTY = False
+_LAST_SAVE_TIME = 0.0
+SAVES_ENABLED = True
+# Set by headless tools (--simulate, rpg_sim) to skip blocking splash screens.
+HEADLESS = False
+
+
+def mark_save_dirty():
+    global _SAVE_DIRTY
+    _SAVE_DIRTY = True
+
+
+def maybe_flush_save(now=None):
+    if not _SAVE_DIRTY:
+        return False
+    if now is None:
+        now = time.time()
+    if now - _LAST_SAVE_TIME < SAVE_DEBOUNCE_INTERVAL:
+        return False
+    save_game()
+    return True
+
+
+def flush_save():
+    if _SAVE_DIRTY:
+        save_game()
+    wait_for_save_writer()
+    return True
+
+
+_SAVE_WRITER_LOCK = threading.Condition()
+_SAVE_WRITER_PENDING = None
+_SAVE_WRITER_BUSY = False
+_SAVE_WRITER_THREAD = None
+
+
+def snapshot_game_state():
+    # Copies containers and shares the immutable leaves, which is all a
+    # JSON save needs and much cheaper than copy.deepcopy.
+    return game.to_payload()
+
+
+def write_save_payload(target_path, payload, fmt=save_codec.FORMAT_JSON):
     tmp_path = target_path + ".tmp"
     os.makedirs(os.path.dirname(target_path), exist_ok=True)
     try:
-        with open(tmp_path, "w") as handle:
-            json.dump(payload, handle)
+        data = save_codec.encode(payload, fmt)
+        with open(tmp_path, "wb") as handle:
+            handle.write(data)
         os.replace(tmp_path, target_path)
+        # Switching formats renames the slot file; drop the old copy.
+        stem = os.path.splitext(target_path)[0]
+        for ext in save_codec.EXTENSIONS.values():
+            stale = stem + ext
+            if stale != target_path and os.path.exists(stale):
+                os.remove(stale)
     except Exception:
         try:
             if os.path.exists(tmp_path):
@@ -2492,136 +2646,82 @@ def save_game():
             pass
 
 
-def load_game():
-    candidate_paths = [current_save_path()]
-    if ACTIVE_SLOT_INDEX == 0 and os.path.exists(LEGACY_SAVE_PATH):
-        candidate_paths.append(LEGACY_SAVE_PATH)
-    payload = None
-    for path in candidate_paths:
-        if not os.path.exists(path):
-            continue
+def _save_writer_loop():
+    global _SAVE_WRITER_PENDING, _SAVE_WRITER_BUSY
+    while True:
+        with _SAVE_WRITER_LOCK:
+            while _SAVE_WRITER_PENDING is None:
+                _SAVE_WRITER_LOCK.wait()
+            target_path, payload, fmt = _SAVE_WRITER_PENDING
+            _SAVE_WRITER_PENDING = None
+            _SAVE_WRITER_BUSY = True
         try:
-            with open(path, "r") as handle:
-                data = json.load(handle)
-            if isinstance(data, dict):
-                payload = data
-                break
-        except Exception:
-            continue
-    state = default_game_state()
-    if payload:
-        state.update(payload)
-        rpg_state = payload.get("rpg_data")
-        if not isinstance(rpg_state, dict):
-            rpg_state = default_rpg_data()
-        else:
-            defaults = default_rpg_data()
-            for key, value in defaults.items():
-                if key not in rpg_state or rpg_state[key] is None:
-                    rpg_state[key] = copy.deepcopy(value) if isinstance(value, (dict, list)) else value
-        state["rpg_data"] = rpg_state
-    if "breach_key_obtained" not in state:
-        state["breach_key_obtained"] = False
-    if "breach_door_open" not in state:
-        state["breach_door_open"] = bool(state.get("rpg_unlocked", False))
-    if state.get("breach_door_open"):
-        state["rpg_unlocked"] = True
-        state["breach_key_obtained"] = True
-    if "settings_disable_steam" not in state:
-        state["settings_disable_steam"] = False
-    if "settings_show_signal_debug" not in state:
-        state["settings_show_signal_debug"] = False
-    # migrate/load persisted keybinds and settings
-    if "keybinds" not in state or not isinstance(state.get("keybinds"), dict):
-        state["keybinds"] = DEFAULT_KEYBINDS.copy()
-    state.setdefault("settings", {})
-    defaults = {
-        "auto_fullscreen": getattr(config, "AUTO_FULLSCREEN", False),
-        "escape_mode": getattr(config, "ESCAPE_MODE", True),
-        "beeps": True,
-        "color_theme": "default",
-        "show_floating_hints": True,
-        "autosave": True,
-    }
-    for k, v in defaults.items():
-        state["settings"].setdefault(k, v)
-    state.setdefault("settings_notice", "")
-    state.setdefault("settings_notice_until", 0.0)
-    state.setdefault("settings_cursor", 0)
-    state.setdefault("breach_door_manifested", bool(state.get("breach_key_obtained", False)))
-    state.setdefault("time_progress", 0.0)
-    state.setdefault("time_stratum", 0)
-    state.setdefault("time_velocity", 1.0)
-    state.setdefault("time_reward_multiplier", 1.0)
-    state.setdefault("manual_tap_counter", 0)
-    state.setdefault("last_manual_press_ts", 0.0)
-    state.setdefault("hold_tip_shown", False)
-    state.setdefault("automation_currency", 0.0)
-    state.setdefault("scientific_threshold_exp", SCIENTIFIC_THRESHOLD_DEFAULT)
-    state.setdefault("quick_travel_target", "work")
-    state.setdefault("motivation_unlocked", False)
-    state.setdefault("motivation_cap_bonus", 0)
-    state.setdefault("motivation_strength_mult", 1.0)
-    state.setdefault("challenges_feature_unlocked", False)
-    state.setdefault("challenge_intro_seen", False)
-    state.setdefault("challenge_cursor", 0)
-    state.setdefault("challenge_page", 0)
-    state.setdefault("challenge_instability_installed", False)
-    state.setdefault("guide_cursor", 0)
-    state.setdefault("guide_unlocked", False)
-    state.setdefault("guide_seen_topics", [])
-    state.setdefault("guide_has_new", False)
-    state.setdefault("rpg_tutorial_shown", False)
-    state.setdefault("automation_upgrades", [])
-    state.setdefault("automation_page", 0)
-    state.setdefault("automation_delay_mult", 1.0)
-    state.setdefault("automation_gain_mult", 1.0)
-    state.setdefault("automation_synergy_mult", 1.0)
-    state.setdefault("automation_auto_tiers", 0)
-    state.setdefault("_challenge_backup", None)
-    state.setdefault("challenge_run_active", False)
-    state.setdefault("challenge_run_id", None)
-    state.setdefault("escape_multiplier", 1.0)
-    state.setdefault("mirror_reality_active", False)
-    machine_state = state.get("escape_machine")
-    if not isinstance(machine_state, dict):
-        machine_state = default_escape_machine_state()
-    else:
-        defaults = default_escape_machine_state()
-        for key, value in defaults.items():
-            machine_state.setdefault(key, value)
-    state["escape_machine"] = machine_state
-    state.setdefault("escape_machine_unlocked", machine_state.get("unlocked", False))
-    state.setdefault("escape_machine_ready", machine_state.get("ready", False))
-    challenge_state = state.get("challenge_state")
-    if not isinstance(challenge_state, dict):
-        state["challenge_state"] = default_challenge_state()
-    else:
-        challenge_state.setdefault("active_id", None)
-        baseline = challenge_state.get("baseline")
-        if not isinstance(baseline, dict):
-            challenge_state["baseline"] = {}
-        challenge_state.setdefault("started_at", 0.0)
-        events = challenge_state.get("event_progress")
-        if not isinstance(events, dict):
-            challenge_state["event_progress"] = {}
-    state.setdefault("challenges_completed", [])
-    state.setdefault("auto_buyer_unlocked", False)
-    state.setdefault("stability_manual_resets", 0)
-    raw_wake_upgrades = state.get("wake_timer_upgrades")
-    if isinstance(raw_wake_upgrades, dict):
-        cleaned = {}
-        for key, value in raw_wake_upgrades.items():
+            write_save_payload(target_path, payload, fmt)
+        finally:
+            with _SAVE_WRITER_LOCK:
+                _SAVE_WRITER_BUSY = False
+                _SAVE_WRITER_LOCK.notify_all()
+
+
+def _ensure_save_writer():
+    global _SAVE_WRITER_THREAD
+    if _SAVE_WRITER_THREAD is not None and _SAVE_WRITER_THREAD.is_alive():
+        return
+    _SAVE_WRITER_THREAD = threading.Thread(target=_save_writer_loop, daemon=True)
+    _SAVE_WRITER_THREAD.start()
+
+
+def queue_save_payload(target_path, payload, fmt=save_codec.FORMAT_JSON):
+    global _SAVE_WRITER_PENDING
+    _ensure_save_writer()
+    with _SAVE_WRITER_LOCK:
+        if _SAVE_WRITER_PENDING is not None and _SAVE_WRITER_PENDING[0] != target_path:
+            # Never drop a write meant for another slot; let it land first.
+            while _SAVE_WRITER_PENDING is not None:
+                _SAVE_WRITER_LOCK.wait()
+        # A newer snapshot for the same slot supersedes any unwritten one.
+        _SAVE_WRITER_PENDING = (target_path, payload, fmt)
+        _SAVE_WRITER_LOCK.notify_all()
+
+
+def wait_for_save_writer():
+    with _SAVE_WRITER_LOCK:
+        while _SAVE_WRITER_PENDING is not None or _SAVE_WRITER_BUSY:
+            _SAVE_WRITER_LOCK.wait()
+
+
+def current_save_format():
+    settings = game.get("settings")
+    fmt = settings.get("save_format") if isinstance(settings, dict) else None
+    return save_codec.normalize_format(fmt)
+
+
+def save_game():
+    global _SAVE_DIRTY, _LAST_SAVE_TIME
+    if not SAVES_ENABLED:
+        _SAVE_DIRTY = False
+        return
+    ensure_rpg_state()
+    game["last_save_timestamp"] = time.time()
+    _SAVE_DIRTY = False
+    _LAST_SAVE_TIME = game["last_save_timestamp"]
+    with FRAME_PROFILER.phase("save"):
+        fmt = current_save_format()
+        queue_save_payload(current_save_path(fmt), snapshot_game_state(), fmt)
+
+
+def _normalize_wake_upgrades(raw):
+    cleaned = {}
+    if isinstance(raw, dict):
+        for key, value in raw.items():
             try:
                 lvl = int(value)
             except (TypeError, ValueError):
                 continue
             if lvl > 0:
                 cleaned[key] = lvl
-        state["wake_timer_upgrades"] = cleaned
-    elif isinstance(raw_wake_upgrades, list):
-        cleaned = {}
-        for entry in raw_wake_upgrades:
+    elif isinstance(raw, list):
+        for entry in raw:
             if isinstance(entry, dict):
                 uid = entry.get("id")
                 lvl = entry.get("level", 1)
@@ -2637,9 +2737,67 @@ def load_game():
             if lvl <= 0:
                 continue
             cleaned[uid] = max(cleaned.get(uid, 0), lvl)
-        state["wake_timer_upgrades"] = cleaned
+    return cleaned
+
+
+_SAVE_CONTAINER_FIELDS = (
+    "rpg_data",
+    "keybinds",
+    "settings",
+    "escape_machine",
+    "challenge_state",
+    "wake_timer_upgrades",
+)
+
+
+def save_state_well_formed(state):
+    return all(isinstance(state.get(key), dict) for key in _SAVE_CONTAINER_FIELDS)
+
+
+def repair_save_state(state):
+    """Coerce damaged container fields back to the shapes the game expects.
+
+    Runs while migrating legacy saves and when a current save fails
+    ``save_state_well_formed``; intact saves never pay for it.
+    """
+    if not isinstance(state.get("rpg_data"), dict):
+        state["rpg_data"] = default_rpg_data()
+    if not isinstance(state.get("keybinds"), dict):
+        state["keybinds"] = DEFAULT_KEYBINDS.copy()
+    if not isinstance(state.get("settings"), dict):
+        state["settings"] = default_settings()
+    if not isinstance(state.get("escape_machine"), dict):
+        state["escape_machine"] = default_escape_machine_state()
+    challenge_state = state.get("challenge_state")
+    if not isinstance(challenge_state, dict):
+        state["challenge_state"] = default_challenge_state()
     else:
-        state["wake_timer_upgrades"] = {}
+        if not isinstance(challenge_state.get("baseline"), dict):
+            challenge_state["baseline"] = {}
+        if not isinstance(challenge_state.get("event_progress"), dict):
+            challenge_state["event_progress"] = {}
+    state["wake_timer_upgrades"] = _normalize_wake_upgrades(state.get("wake_timer_upgrades"))
+    return state
+
+
+def _migrate_save_v0(state):
+    # Saves from before save_version: nested records could be missing keys,
+    # wake upgrades were stored as a list, and a few flags were derived.
+    repair_save_state(state)
+    rpg_state = state["rpg_data"]
+    for key, value in default_rpg_data().items():
+        if rpg_state.get(key) is None:
+            rpg_state[key] = value
+    for key, value in default_settings().items():
+        state["settings"].setdefault(key, value)
+    for key, value in default_escape_machine_state().items():
+        state["escape_machine"].setdefault(key, value)
+    challenge_state = state["challenge_state"]
+    challenge_state.setdefault("active_id", None)
+    challenge_state.setdefault("started_at", 0.0)
+    if state.get("breach_door_open"):
+        state["rpg_unlocked"] = True
+        state["breach_key_obtained"] = True
     if not state.get("guide_unlocked"):
         total_money = max(
             float(state.get("money_since_reset", 0.0)),
@@ -2647,8 +2805,61 @@ def load_game():
         )
         if total_money >= FIELD_GUIDE_UNLOCK_TOTAL or state.get("stability_resets", 0) >= 1:
             state["guide_unlocked"] = True
-    game.clear()
-    game.update(state)
+
+
+def _migrate_save_v1(state):
+    # Slots written before the packed codec stay JSON until the player
+    # switches them in Settings.
+    state["settings"].setdefault("save_format", save_codec.FORMAT_JSON)
+
+
+# SAVE_MIGRATIONS[n] upgrades a version-n save to n + 1. Each step sees the
+# payload already merged over default_game_state(), so a new top-level
+# field with a constant default needs no step of its own.
+SAVE_MIGRATIONS = {
+    0: _migrate_save_v0,
+    1: _migrate_save_v1,
+}
+
+
+def migrate_save_state(state):
+    """Bring a loaded payload up to SAVE_VERSION, one recorded step at a time."""
+    try:
+        version = int(state.get("save_version") or 0)
+    except (TypeError, ValueError):
+        version = 0
+    applied = state.get("save_migrations")
+    applied = list(applied) if isinstance(applied, list) else []
+    while version < SAVE_VERSION:
+        SAVE_MIGRATIONS[version](state)
+        version += 1
+        applied.append(version)
+    state["save_migrations"] = applied
+    state["save_version"] = version
+    return state
+
+
+def load_game():
+    wait_for_save_writer()
+    candidate_paths = [current_save_path()]
+    if ACTIVE_SLOT_INDEX == 0 and os.path.exists(LEGACY_SAVE_PATH):
+        candidate_paths.append(LEGACY_SAVE_PATH)
+    payload = None
+    for path in candidate_paths:
+        if not os.path.exists(path):
+            continue
+        try:
+            payload = save_codec.read_file(path)
+            break
+        except (OSError, save_codec.SaveDecodeError):
+            continue
+    state = default_game_state()
+    if payload:
+        state.update(payload)
+        migrate_save_state(state)
+        if not save_state_well_formed(state):
+            repair_save_state(state)
+    game.load_payload(state)
     sync_scientific_threshold(game.get("scientific_threshold_exp"))
     ensure_rpg_state()
     apply_inspiration_effects()
@@ -3143,10 +3354,8 @@ def load_slot_payload(path):
     if not path or not os.path.exists(path):
         return None
     try:
-        with open(path, "r") as f:
-            data = json.load(f)
-        return data if isinstance(data, dict) else None
-    except Exception:
+        return save_codec.read_file(path)
+    except (OSError, save_codec.SaveDecodeError):
         return None
 
 
@@ -3304,6 +3513,7 @@ def finalize_slot_choice(selected):
         else:
             with open(summary["target_path"], "w", encoding="utf-8") as fh:
                 json.dump(default_game_state(), fh)
+    flush_save()
     ACTIVE_SLOT_INDEX = selected
     clear_screen()
 
@@ -3340,9 +3550,9 @@ def choose_save_slot_windows():
             if ch == "D":
                 confirm = input(f"Erase slot {selected + 1}? Type YES to confirm: ")
                 if confirm.strip().lower() == "yes":
-                    path = slot_save_path(selected)
-                    if os.path.exists(path):
-                        os.remove(path)
+                    for path in slot_save_paths(selected):
+                        if os.path.exists(path):
+                            os.remove(path)
                     if selected == 0 and os.path.exists(LEGACY_SAVE_PATH):
                         os.remove(LEGACY_SAVE_PATH)
                     summaries = collect_slot_summaries()
@@ -3450,9 +3660,9 @@ def choose_save_slot():
                     finally:
                         tty.setcbreak(fd)
                     if confirm.strip().lower() == "yes":
-                        path = slot_save_path(selected)
-                        if os.path.exists(path):
-                            os.remove(path)
+                        for path in slot_save_paths(selected):
+                            if os.path.exists(path):
+                                os.remove(path)
                         if selected == 0 and os.path.exists(LEGACY_SAVE_PATH):
                             os.remove(LEGACY_SAVE_PATH)
                     continue
@@ -3491,9 +3701,9 @@ def choose_save_slot():
             if raw_choice == "D":
                 confirm = input(f"Erase slot {selected + 1}? Type YES to confirm: ")
                 if confirm.strip().lower() == "yes":
-                    path = slot_save_path(selected)
-                    if os.path.exists(path):
-                        os.remove(path)
+                    for path in slot_save_paths(selected):
+                        if os.path.exists(path):
+                            os.remove(path)
                     if selected == 0 and os.path.exists(LEGACY_SAVE_PATH):
                         os.remove(LEGACY_SAVE_PATH)
                 continue
@@ -3523,122 +3733,15 @@ def refresh_knowledge_flags():
         updated |= attempt_reveal("ui_currency_clear")
         updated |= attempt_reveal("ui_upgrade_catalogue")
         updated |= attempt_reveal("escape_window")
-    if game.get("auto_work_unlocked"):
+    if game.auto_work_unlocked:
         updated |= attempt_reveal("ui_auto_prompt")
-    if game.get("stability_resets", 0) >= 1:
+    if game.stability_resets >= 1:
         updated |= attempt_reveal("escape_route")
-    if game.get("concept_resets", 0) >= 1:
+    if game.concept_resets >= 1:
         updated |= attempt_reveal("escape_signal")
     return updated
 
 
-def ansi_center(text, width):
-    vis = visible_len(text)
-    pad_left = max(0, (width - vis) // 2)
-    pad_right = max(0, width - vis - pad_left)
-    return " " * pad_left + text + " " * pad_right
-
-
-def visible_len(s):
-    clean = ANSI_ESCAPE.sub("", s)
-    if _wcwidth:
-        return sum(max(_wcwidth(c), 0) for c in clean)
-    return len(clean)
-
-
-def ansi_visible_slice(s: str, start: int, width: int) -> str:
-    if width <= 0:
-        return ""
-    out = []
-    esc_buf = []
-    vis = 0
-    end = start + width
-    i = 0
-    had_esc = False
-    while i < len(s):
-        ch = s[i]
-        if ch == "\x1b":
-            m = ANSI_ESCAPE.match(s, i)
-            if m:
-                seq = m.group(0)
-                esc_buf.append(seq)
-                had_esc = True
-                i += len(seq)
-                continue
-            else:
-                i += 1
-                continue
-        if vis >= start and vis < end:
-            if esc_buf:
-                out.extend(esc_buf)
-                esc_buf = []
-            out.append(ch)
-        vis += 1
-        i += 1
-        if vis >= end:
-            break
-    result = "".join(out)
-    if had_esc and result and RESET_SEQ and RESET_SEQ not in result:
-        result += RESET_SEQ
-    return result
-
-
-def wrap_visible_text(text: str, width: int) -> list[str]:
-    if width <= 0:
-        return [text or ""]
-    if text is None:
-        return [""]
-    segments = []
-    buffer = []
-    buffer_width = 0
-    i = 0
-    while i < len(text):
-        ch = text[i]
-        if ch == "\x1b":
-            match = ANSI_ESCAPE.match(text, i)
-            if match:
-                seq = match.group(0)
-                buffer.append(seq)
-                i += len(seq)
-                continue
-        if ch == "\n":
-            segments.append("".join(buffer))
-            buffer = []
-            buffer_width = 0
-            i += 1
-            continue
-        char_width = 1
-        if _wcwidth:
-            w = _wcwidth(ch)
-            if w is not None:
-                char_width = max(w, 0)
-        if buffer_width and buffer_width + char_width > width:
-            segments.append("".join(buffer))
-            buffer = []
-            buffer_width = 0
-            continue
-        buffer.append(ch)
-        buffer_width += char_width
-        if buffer_width >= width:
-            segments.append("".join(buffer))
-            buffer = []
-            buffer_width = 0
-        i += 1
-    if buffer or not segments:
-        segments.append("".join(buffer))
-    return segments
-
-
-def pad_visible_line(text, width):
-    if width <= 0:
-        return ""
-    snippet = ansi_visible_slice(text or "", 0, width)
-    vis = visible_len(snippet)
-    if vis < width:
-        snippet += " " * (width - vis)
-    return snippet
-
-
 def get_term_size():
     try:
         s = shutil.get_terminal_size(fallback=(80, 24))
@@ -3648,6 +3751,8 @@ def get_term_size():
 
 
 def clear_screen():
+    global last_render
+    last_render = ""
     if os.name == "nt":
         os.system("cls")
         sys.stdout.flush()
@@ -3714,6 +3819,37 @@ def render_frame(lines):
     last_render = ""
 
 
+def present_frame(lines):
+    """Write a full-screen frame, repainting only the rows that changed.
+
+    ``last_render`` doubles as the invalidation flag used across the UI:
+    clearing it (after overlays, resizes, clear_screen) forces a full
+    repaint on the next call.
+    """
+    global last_render, last_frame_lines
+    frame = "\n".join(lines)
+    if frame == last_render:
+        return False
+    if not last_render:
+        out = "\033[H" + frame
+    else:
+        previous = last_frame_lines
+        parts = []
+        for row, line in enumerate(lines):
+            if row < len(previous) and previous[row] == line:
+                continue
+            parts.append(f"\033[{row + 1};1H{RESET_SEQ}{line}")
+        for row in range(len(lines), len(previous)):
+            parts.append(f"\033[{row + 1};1H\033[2K")
+        out = "".join(parts)
+    with FRAME_PROFILER.phase("io"):
+        sys.stdout.write(out)
+        sys.stdout.flush()
+    last_render = frame
+    last_frame_lines = list(lines)
+    return True
+
+
 # --- Animated Upgrade Art Helpers ---
 from config import UPGRADE_ANIM_FRAMES
 
@@ -3812,51 +3948,33 @@ def tree_catalogue_meta(upgrades):
     }
 
 
-def build_tree_lines(upgrades, get_info_fn, page_key):
+_TREE_LAYOUT_CACHE = {}
+TREE_LAYOUT_CACHE_LIMIT = 32
+
+
+def tree_catalogue_layout(upgrades, get_info_fn, meta):
+    """Paginate a catalogue once per terminal size and set of owned levels.
+
+    Entries keep their description and divider lines; the header colour,
+    cost and holdings lines are filled in by ``build_tree_lines``.
+    """
     term_w, term_h = get_term_size()
+    applied = tuple(
+        (entry.get("id"), entry.get("level", 1)) if isinstance(entry, dict) else (entry, 1)
+        for entry in game.get(meta.get("applied_key", ""), [])
+    )
+    key = (id(upgrades), term_w, term_h, applied)
+    pages = _TREE_LAYOUT_CACHE.get(key)
+    if pages is not None:
+        return pages
     max_lines = term_h // 2 - 6
-    meta = tree_catalogue_meta(upgrades)
-    suffix_raw = meta.get("currency_suffix")
-    suffix = f" {suffix_raw}" if suffix_raw else ""
-    pool_currency = meta.get("pool_currency", "")
-    holdings_key = meta.get("holdings_key", "concepts")
-                                                                                          
     desc_width = max(int(term_w * 0.25) - 6, 18)
+    divider = f"    {Fore.LIGHTBLACK_EX}{'-' * max(24, desc_width // 2)}{Style.RESET_ALL}"
     pages, current, used = [], [], 0
     for i, u in enumerate(upgrades, start=1):
-        owned, level = get_info_fn(u["id"])
+        _, level = get_info_fn(u["id"])
         max_level = u.get("max_level", 1)
-        cost = get_tree_cost(u, current_level=level)
-        base_value = u.get("base_value", u.get("value", 1.0))
-        value_mult = u.get("value_mult", 1.0)
-        total_mult = (
-            base_value * (value_mult ** max(0, (level - 1)))
-            if level > 0
-            else base_value
-        )
-        holdings = game.get(holdings_key, 0)
-        can_afford = holdings >= cost and level < max_level
-        status_color = (
-            Fore.GREEN
-            if level >= max_level
-            else (Fore.CYAN if can_afford else Fore.RED)
-        )
-        lvl_text = f"Lv {min(level, max_level)}/{max_level}"
-        lines = [
-            f"{status_color}{i}. {u['name']}{Style.RESET_ALL}  {Fore.YELLOW}{lvl_text}{Style.RESET_ALL}"
-        ]
-        if level >= max_level:
-            lines.append(
-                f"    {Fore.GREEN}MAXED — permanent bonus locked{Style.RESET_ALL}"
-            )
-        else:
-            lines.append(
-                f"    Cost: {Fore.LIGHTYELLOW_EX}{format_number(cost)}{suffix}{Style.RESET_ALL}"
-            )
-            lines.append(
-                f"    You:  {Fore.LIGHTYELLOW_EX}{format_number(holdings)}{suffix}{Style.RESET_ALL}"
-                f"  ({pool_currency})"
-            )
+        detail = []
         if u.get("desc"):
             desc_text = f"→ {u['desc']}"
             if level > 0 and u["type"] not in (
@@ -3865,26 +3983,71 @@ def build_tree_lines(upgrades, get_info_fn, page_key):
                 "motivation_cap",
                 "motivation_strength",
             ):
+                base_value = u.get("base_value", u.get("value", 1.0))
+                value_mult = u.get("value_mult", 1.0)
+                total_mult = base_value * (value_mult ** max(0, (level - 1)))
                 desc_text += f" (x{total_mult:.2f})"
             wrapped = wrap_ui_text(desc_text, width=desc_width, reserved=4)
-            lines += [f"    {Fore.LIGHTBLACK_EX}{w}{Style.RESET_ALL}" for w in wrapped]
-        lines.append(
-            f"    {Fore.LIGHTBLACK_EX}{'-' * max(24, desc_width // 2)}{Style.RESET_ALL}"
-        )
-        if used + len(lines) > max_lines and current:
+            detail += [f"    {Fore.LIGHTBLACK_EX}{w}{Style.RESET_ALL}" for w in wrapped]
+        detail.append(divider)
+        height = (2 if level >= max_level else 3) + len(detail)
+        if used + height > max_lines and current:
             pages.append(current)
             current, used = [], 0
-        current += lines
-        used += len(lines)
+        current.append((i, u, level, max_level, tuple(detail)))
+        used += height
     if current:
         pages.append(current)
+    if len(_TREE_LAYOUT_CACHE) >= TREE_LAYOUT_CACHE_LIMIT:
+        _TREE_LAYOUT_CACHE.clear()
+    _TREE_LAYOUT_CACHE[key] = pages
+    return pages
+
+
+def build_tree_lines(upgrades, get_info_fn, page_key):
+    meta = tree_catalogue_meta(upgrades)
+    suffix_raw = meta.get("currency_suffix")
+    suffix = f" {suffix_raw}" if suffix_raw else ""
+    pool_currency = meta.get("pool_currency", "")
+    holdings_key = meta.get("holdings_key", "concepts")
+    holdings = game.get(holdings_key, 0)
+
+    pages = tree_catalogue_layout(upgrades, get_info_fn, meta)
     current_page = game.setdefault(page_key, 0)
     max_idx = max(0, len(pages) - 1)
     current_page = max(0, min(current_page, max_idx))
     game[page_key] = current_page
     total_pages = max(1, len(pages))
     game[f"{page_key}_pages"] = total_pages
-    visible_lines = pages[current_page] if pages else ["(no upgrades)"]
+    if not pages:
+        visible_lines = ["(no upgrades)"]
+    else:
+        visible_lines = []
+        for i, u, level, max_level, detail in pages[current_page]:
+            cost = get_tree_cost(u, current_level=level)
+            can_afford = holdings >= cost and level < max_level
+            status_color = (
+                Fore.GREEN
+                if level >= max_level
+                else (Fore.CYAN if can_afford else Fore.RED)
+            )
+            lvl_text = f"Lv {min(level, max_level)}/{max_level}"
+            visible_lines.append(
+                f"{status_color}{i}. {u['name']}{Style.RESET_ALL}  {Fore.YELLOW}{lvl_text}{Style.RESET_ALL}"
+            )
+            if level >= max_level:
+                visible_lines.append(
+                    f"    {Fore.GREEN}MAXED — permanent bonus locked{Style.RESET_ALL}"
+                )
+            else:
+                visible_lines.append(
+                    f"    Cost: {Fore.LIGHTYELLOW_EX}{format_number(cost)}{suffix}{Style.RESET_ALL}"
+                )
+                visible_lines.append(
+                    f"    You:  {Fore.LIGHTYELLOW_EX}{format_number(holdings)}{suffix}{Style.RESET_ALL}"
+                    f"  ({pool_currency})"
+                )
+            visible_lines.extend(detail)
     footer = f"Page {current_page+1}/{total_pages}  (z, x to switch)"
     return visible_lines, footer, len(pages)
 
@@ -3899,8 +4062,8 @@ def signal_exchange_rate():
 
 def calculate_signal_exchange_capacity():
     rate = signal_exchange_rate()
-    funds = max(0.0, float(game.get("money", 0.0) or 0.0))
-    max_bits = int(funds // rate)
+    funds = max(0.0, game.get("money", 0.0) or 0.0)
+    max_bits = bignum.whole(funds // rate)
     return rate, funds, max_bits
 
 
@@ -3990,9 +4153,9 @@ def exchange_signal_bits(amount=None, *, prompt=False):
         target = prompt_signal_exchange_amount(max_bits)
     if target <= 0:
         return False
-    cost = target * rate
-    game["money"] = max(0.0, float(game.get("money", 0.0)) - cost)
-    game["automation_currency"] = game.get("automation_currency", 0.0) + target
+    cost = bignum.mul(target, rate)
+    game["money"] = max(0.0, game.get("money", 0.0) - cost)
+    game["automation_currency"] = bignum.add(game.get("automation_currency", 0.0), target)
     save_game()
     set_settings_notice(
         f"Refined {format_number(target)} {AUTOMATION_CURRENCY_NAME}.",
@@ -4029,6 +4192,7 @@ def balanced_breach_key_cost():
 
 
 def apply_inspiration_effects():
+    invalidate_upgrade_effects()
     game["motivation_unlocked"] = False
     game["motivation_cap_bonus"] = 0
     game["motivation_strength_mult"] = 1.0
@@ -4149,7 +4313,7 @@ def process_auto_buyers():
             if not purchased:
                 break
     if progress:
-        save_game()
+        mark_save_dirty()
     return progress
 
 
@@ -4595,25 +4759,47 @@ def open_guide_book():
         if k in {"w", "s"} and topics:
             delta = -1 if k == "w" else 1
             game["guide_cursor"] = (cursor + delta) % len(topics)
-def compute_gain_and_delay(auto=False):
-    base_gain = BASE_MONEY_GAIN
-    base_delay = BASE_WORK_DELAY
+_UPGRADE_EFFECT_CACHE = None
+
+
+def invalidate_upgrade_effects():
+    global _UPGRADE_EFFECT_CACHE
+    _UPGRADE_EFFECT_CACHE = None
+    invalidate_panels()
+
+
+def _upgrade_value(u, level):
+    base = float(u.get("base_value", u.get("value", 1)))
+    step = float(u.get("value_mult", 1))
+    return base * (step ** max(0, level - 1))
+
+
+def _tree_entries(entries):
+    for entry in entries:
+        if isinstance(entry, dict):
+            yield entry.get("id"), entry.get("level", 1)
+        else:
+            yield entry, 1
+
+
+def upgrade_effect_totals():
+    global _UPGRADE_EFFECT_CACHE
+    if _UPGRADE_EFFECT_CACHE is not None:
+        return _UPGRADE_EFFECT_CACHE
     gain_add = 0.0
     gain_mult = 1.0
     delay_mult = 1.0
-    mods = active_challenge_modifiers()
-    for entry in game.get("inspiration_upgrades", []):
-        upg_id, level = (
-            (entry.get("id"), entry.get("level", 1))
-            if isinstance(entry, dict)
-            else (entry, 1)
-        )
-        u = next((x for x in INSPIRE_UPGRADES if x["id"] == upg_id), None)
+    auto_gain_mult = 1.0
+    inspire_rate_mult = 1.0
+    inspire_final_mult = 1.0
+    concept_rate_mult = 1.0
+    concept_final_mult = 1.0
+    unlock_rpg = False
+    for upg_id, level in _tree_entries(game.get("inspiration_upgrades", [])):
+        u = INSPIRE_UPGRADE_BY_ID.get(upg_id)
         if not u:
             continue
-        base = float(u.get("base_value", u.get("value", 1)))
-        step = float(u.get("value_mult", 1))
-        val = base * (step ** max(0, level - 1))
+        val = _upgrade_value(u, level)
         t = u.get("type")
         if t in ("money_mult", "mult", "money"):
             gain_mult *= val
@@ -4621,39 +4807,37 @@ def compute_gain_and_delay(auto=False):
             gain_add += val
         elif t in ("work_mult", "reduce_delay"):
             delay_mult *= val
-    for entry in game.get("concept_upgrades", []):
-        upg_id, level = (
-            (entry.get("id"), entry.get("level", 1))
-            if isinstance(entry, dict)
-            else (entry, 1)
-        )
-        u = next((x for x in CONCEPT_UPGRADES if x["id"] == upg_id), None)
+        elif t == "inspire_rate":
+            inspire_rate_mult *= val
+        elif t == "inspire_mult":
+            inspire_final_mult *= val
+    for upg_id, level in _tree_entries(game.get("concept_upgrades", [])):
+        u = CONCEPT_UPGRADE_BY_ID.get(upg_id)
         if not u:
             continue
-        base = float(u.get("base_value", u.get("value", 1)))
-        step = float(u.get("value_mult", 1))
-        val = base * (step ** max(0, level - 1))
+        val = _upgrade_value(u, level)
         t = u.get("type")
         if t in ("money_mult", "mult", "money"):
             gain_mult *= val
         elif t == "auto_money_mult":
-            if auto:
-                gain_mult *= val
+            auto_gain_mult *= val
         elif t in ("add", "value"):
             gain_add += val
         elif t in ("work_mult", "reduce_delay"):
             delay_mult *= val
+        elif t == "concept_rate":
+            concept_rate_mult *= val
+        elif t == "concept_mult":
+            concept_final_mult *= val
         elif t == "unlock_rpg" and level > 0:
-            game["breach_key_obtained"] = True
+            unlock_rpg = True
     for uid, lvl in game.get("upgrade_levels", {}).items():
         if lvl <= 0:
             continue
-        u = next((x for x in UPGRADES if x["id"] == uid), None)
+        u = UPGRADE_BY_ID.get(uid)
         if not u:
             continue
-        base = float(u.get("base_value", u.get("value", 1)))
-        step = float(u.get("value_mult", 1))
-        val = base * (step ** max(0, lvl - 1))
+        val = _upgrade_value(u, lvl)
         t = u.get("type")
         if t in ("money_mult", "mult", "money"):
             gain_mult *= val
@@ -4661,28 +4845,53 @@ def compute_gain_and_delay(auto=False):
             gain_add += val
         elif t in ("work_mult", "reduce_delay", "reduce_cd"):
             delay_mult *= val
-        elif t == "unlock_focus" and lvl > 0:
-                                                           
-            pass
-        elif t == "unlock_rpg" and lvl > 0:
-            game["breach_key_obtained"] = True
+        elif t == "unlock_rpg":
+            unlock_rpg = True
+    _UPGRADE_EFFECT_CACHE = {
+        "gain_add": gain_add,
+        "gain_mult": gain_mult,
+        "delay_mult": delay_mult,
+        "auto_gain_mult": auto_gain_mult,
+        "inspire_rate_mult": inspire_rate_mult,
+        "inspire_final_mult": inspire_final_mult,
+        "concept_rate_mult": concept_rate_mult,
+        "concept_final_mult": concept_final_mult,
+        "unlock_rpg": unlock_rpg,
+    }
+    return _UPGRADE_EFFECT_CACHE
 
-    if game.get("motivation_unlocked", False):
+
+def compute_gain_and_delay(auto=False, motivation=None):
+    base_gain = BASE_MONEY_GAIN
+    base_delay = BASE_WORK_DELAY
+    effects = upgrade_effect_totals()
+    gain_add = effects["gain_add"]
+    gain_mult = effects["gain_mult"]
+    delay_mult = effects["delay_mult"]
+    if auto:
+        gain_mult *= effects["auto_gain_mult"]
+    if effects["unlock_rpg"]:
+        game["breach_key_obtained"] = True
+    mods = active_challenge_modifiers()
+
+    if game.motivation_unlocked:
         cap = motivation_capacity()
         peak = motivation_peak_multiplier()
-        motivation = max(0, min(cap, game.get("motivation", cap)))
+        if motivation is None:
+            motivation = game.motivation
+        motivation = max(0, min(cap, motivation))
         ratio = motivation / max(1, cap)
         motivation_mult = 1 + ratio * (peak - 1)
         gain_mult *= motivation_mult
     time_reward = get_time_reward_multiplier()
-    game["time_reward_multiplier"] = time_reward
+    game.time_reward_multiplier = time_reward
     gain_mult *= get_time_money_multiplier(time_reward)
     signal_bonus = max(0.0, get_resonance_efficiency())
     signal_mult = 1.0 + signal_bonus
-    game["signal_multiplier"] = signal_mult
-    automation_synergy = max(0.0, game.get("automation_synergy_mult", 1.0))
-    automation_gain = max(0.0, game.get("automation_gain_mult", 1.0))
-    automation_delay = max(0.01, game.get("automation_delay_mult", 1.0))
+    game.signal_multiplier = signal_mult
+    automation_synergy = max(0.0, game.automation_synergy_mult)
+    automation_gain = max(0.0, game.automation_gain_mult)
+    automation_delay = max(0.01, game.automation_delay_mult)
     if automation_online():
         gain_mult *= automation_synergy if automation_synergy > 0 else 1.0
     if auto:
@@ -4698,7 +4907,7 @@ def compute_gain_and_delay(auto=False):
 
     eff_gain = base_gain * gain_mult + gain_add
     eff_gain *= BASE_MONEY_MULT
-    eff_gain *= max(0.0, game.get("money_mult", 1.0))
+    eff_gain *= max(0.0, game.money_mult)
     eff_gain *= signal_mult
     eff_gain *= escape_multiplier()
     eff_delay = max(base_delay * delay_mult, 0.01)
@@ -4744,17 +4953,14 @@ def boxed_lines(
 
         for s in segs:
             vis_len = visible_len(s)
+            # Only a glyph wider than the box can overflow a wrapped segment.
+            while vis_len > inner_w and s:
+                s = s[:-1]
+                vis_len = visible_len(s)
             pad = inner_w - vis_len
-            if pad < 0:
-                pad = 0
             left = pad // 2
             right = pad - left
-            line_content = " " * left + s + " " * right
-            while visible_len(line_content) > inner_w:
-                line_content = line_content[:-1]
-            while visible_len(line_content) < inner_w:
-                line_content += " "
-            lines.append(v + line_content + v)
+            lines.append(v + " " * left + s + " " * right + v)
 
     for _ in range(pad_bottom):
         lines.append(v + " " * inner_w + v)
@@ -4784,9 +4990,6 @@ def boxed_lines(
 
     left_margin = max(0, (term_w - box_w) // 2)
     margin_str = " " * left_margin
-    assert all(
-        visible_len(line[1:-1]) == inner_w for line in lines[1:-1]
-    ), "Line width mismatch"
     return [margin_str + l for l in lines]
 
 
@@ -4944,22 +5147,46 @@ def perform_work(gain, eff_delay, manual=False):
         if manual:
             show_wake_timer_warning()
         return False
-    game["money"] += gain
-    game["money_since_reset"] += gain
+    game.money = bignum.add(game.money, gain)
+    game.money_since_reset = bignum.add(game.money_since_reset, gain)
     track_manual_work_spam(manual)
     if manual:
         mark_known("ui_work_prompt")
-    if game.get("motivation_unlocked", False):
-        cap = motivation_capacity()
-        current = game.get("motivation", cap)
-        set_motivation(current - 1)
+    if game.motivation_unlocked:
+        set_motivation(game.motivation - 1)
     if not manual and auto_work_allowed():
         work_timer = max(0.0, work_timer - eff_delay)
     check_challenges("work")
-    save_game()
+    mark_save_dirty()
     return True
 
 
+def perform_work_batch(cycles, eff_delay, auto=True):
+    global work_timer
+    cycles = int(cycles)
+    if cycles <= 0 or wake_timer_blocked():
+        return 0
+    motivation = None
+    if game.motivation_unlocked:
+        # Each cycle drains one motivation and income is linear in motivation,
+        # so the batch earns exactly ``cycles`` payouts at the mean level.
+        cap = motivation_capacity()
+        current = max(0.0, min(float(cap), float(game.motivation)))
+        active = min(cycles, math.ceil(current))
+        motivation = (active * current - active * (active - 1) / 2.0) / cycles
+    gain, _ = compute_gain_and_delay(auto=auto, motivation=motivation)
+    total = bignum.mul(gain, cycles)
+    game.money = bignum.add(game.money, total)
+    game.money_since_reset = bignum.add(game.money_since_reset, total)
+    if motivation is not None:
+        set_motivation(current - cycles)
+    if auto:
+        work_timer = max(0.0, work_timer - eff_delay * cycles)
+    check_challenges("work")
+    mark_save_dirty()
+    return cycles
+
+
 
 def stability_reward_multiplier():
     levels = get_wake_upgrade_levels()
@@ -4978,10 +5205,12 @@ def stability_reward_multiplier():
 
 
 def calculate_stability_reward(money_pool):
-    pool = max(0.0, float(money_pool)) + 1.0
-    reward = (pool**STABILITY_REWARD_EXP) * STABILITY_REWARD_MULT
-    reward *= stability_reward_multiplier()
-    reward *= escape_multiplier()
+    pool = bignum.add(max(0.0, money_pool), 1.0)
+    reward = bignum.mul(bignum.power(pool, STABILITY_REWARD_EXP), STABILITY_REWARD_MULT)
+    reward = bignum.mul(reward, stability_reward_multiplier())
+    reward = bignum.mul(reward, escape_multiplier())
+    if bignum.is_big(reward):
+        return reward
     return max(1, int(round(reward)))
 
 
@@ -5000,12 +5229,11 @@ def wipe_to_stability_baseline(state):
     state["wake_timer_locked"] = False
     state["wake_timer_notified"] = False
     state["needs_stability_reset"] = False
+    invalidate_upgrade_effects()
 
 
-def perform_stability_collapse(manual=False):
-    global work_timer, last_render
-    if game.get("wake_timer_infinite", False):
-        return
+def apply_stability_collapse(manual=False):
+    global work_timer
     money_pool = max(game.get("money", 0.0), game.get("money_since_reset", 0.0))
     reward = calculate_stability_reward(money_pool)
     grant_stability_currency(game, reward)
@@ -5016,6 +5244,19 @@ def perform_stability_collapse(manual=False):
     check_collapse_easter_eggs()
     if manual:
         game["stability_manual_resets"] = game.get("stability_manual_resets", 0) + 1
+    work_timer = 0.0
+    wipe_to_stability_baseline(game)
+    recalc_wake_timer_state()
+    refresh_knowledge_flags()
+    check_challenges("stability")
+    return reward
+
+
+def perform_stability_collapse(manual=False):
+    global last_render
+    if game.get("wake_timer_infinite", False):
+        return
+    reward = apply_stability_collapse(manual=manual)
     lines = [
         "Collapse triggered.",
         f"Recovered {format_number(reward)} {STABILITY_CURRENCY_NAME}.",
@@ -5026,12 +5267,8 @@ def perform_stability_collapse(manual=False):
     tmp = boxed_lines(lines, title=" Collapse ", pad_top=1, pad_bottom=1)
     render_frame(tmp)
     time.sleep(1.2)
-    work_timer = 0.0
-    wipe_to_stability_baseline(game)
-    recalc_wake_timer_state()
-    refresh_knowledge_flags()
-    check_challenges("stability")
     save_game()
+    flush_save()
     last_render = ""
     if game.get("wake_timer_infinite", False):
         return
@@ -5054,11 +5291,14 @@ def manual_stability_collapse():
     return True
 
 
-def work_tick():
+def work_tick(delta=None):
     global last_tick_time, work_timer, _LAST_GUIDE_REFRESH
     now = time.time()
-    delta = now - last_tick_time
-    last_tick_time = now
+    if delta is None:
+        delta = now - last_tick_time
+        last_tick_time = now
+    else:
+        last_tick_time += delta
     game["play_time"] = game.get("play_time", 0.0) + delta
     check_session_easter_eggs()
     ensure_challenge_feature()
@@ -5066,37 +5306,137 @@ def work_tick():
     if now - _LAST_GUIDE_REFRESH >= GUIDE_REFRESH_INTERVAL:
         refresh_guide_topics()
         _LAST_GUIDE_REFRESH = now
+    if not advance_economy(delta):
+        return
+    if refresh_knowledge_flags():
+        mark_save_dirty()
+    maybe_flush_save(now)
+
+
+def advance_economy(delta, interactive=True):
+    """Advance the idle economy by ``delta`` seconds.
+
+    Returns False when the wake timer ran out (collapsing if needed), True
+    otherwise. Non-interactive callers (offline catch-up) skip the collapse
+    panel and the resonance minigame.
+    """
+    global work_timer
     advance_time_flow(delta)
-    if not game.get("wake_timer_infinite", False):
-        current_timer = game.get("wake_timer", WAKE_TIMER_START)
+    if not game.wake_timer_infinite:
+        current_timer = game.wake_timer
         if current_timer > 0:
             current_timer = max(0.0, current_timer - delta)
-            game["wake_timer"] = current_timer
+            game.wake_timer = current_timer
         if wake_timer_blocked():
-            if not game.get("needs_stability_reset", False):
-                game["needs_stability_reset"] = True
-                perform_stability_collapse()
-            return
-    game["wake_timer_locked"] = wake_timer_blocked()
+            if not game.needs_stability_reset:
+                game.needs_stability_reset = True
+                if interactive:
+                    perform_stability_collapse()
+                else:
+                    apply_stability_collapse()
+            return False
+    game.wake_timer_locked = wake_timer_blocked()
+
+    if interactive:
+        update_resonance(delta)
+
+    if game.motivation_unlocked and MOTIVATION_REGEN_RATE > 0:
+        cap = motivation_capacity()
+        current = game.motivation
+        regen = MOTIVATION_REGEN_RATE * delta
+        if regen > 0 and current < cap:
+            set_motivation(current + regen)
     
-    update_resonance(delta)
+    auto_ready = auto_work_allowed()
+    if auto_ready and not wake_timer_blocked():
+        _, eff_delay = compute_gain_and_delay(auto=True)
+        work_timer += delta
+        if work_timer >= eff_delay:
+            perform_work_batch(math.floor(work_timer / eff_delay), eff_delay)
+    process_auto_buyers()
+    return True
+
+
+def apply_offline_progress(now=None):
+    last_saved = float(game.get("last_save_timestamp", 0.0) or 0.0)
+    if last_saved <= 0:
+        return None
+    if now is None:
+        now = time.time()
+    elapsed = now - last_saved
+    if elapsed < OFFLINE_PROGRESS_MIN_SECONDS:
+        return None
+    credited = min(elapsed, OFFLINE_PROGRESS_MAX_SECONDS)
+    step = max(OFFLINE_PROGRESS_MIN_STEP, credited / max(1, OFFLINE_PROGRESS_MAX_STEPS))
+    start_money = game.get("money_since_reset", 0.0)
+    start_stratum = int(game.get("time_stratum", 0))
+    earned = 0.0
+    reward = 0
+    collapsed = False
+    remaining = credited
+    # Stop at the first collapse: an open game would be parked in the
+    # stabilizer menu from then on, so nothing further accrues.
+    while remaining > 1e-6:
+        dt = min(step, remaining)
+        if not game.get("wake_timer_infinite", False):
+            timer = game.get("wake_timer", WAKE_TIMER_START)
+            # advance_economy collapses before it runs auto-work, so stop
+            # just short of expiry and let a short final tick collapse.
+            if timer > OFFLINE_PROGRESS_EXPIRY_TICK and dt >= timer:
+                dt = timer - OFFLINE_PROGRESS_EXPIRY_TICK
+            elif timer > 0:
+                dt = min(dt, timer)
+        money_before = game.get("money_since_reset", 0.0)
+        currency_before = game.get("stability_currency", 0)
+        resets_before = game.get("stability_resets", 0)
+        advanced = advance_economy(dt, interactive=False)
+        remaining -= dt
+        if game.get("stability_resets", 0) > resets_before:
+            collapsed = True
+            earned = money_before - start_money
+            reward = game.get("stability_currency", 0) - currency_before
+            break
+        if not advanced:
+            break
+    else:
+        earned = game.get("money_since_reset", 0.0) - start_money
+    refresh_knowledge_flags()
+    mark_save_dirty()
+    return {
+        "elapsed": elapsed,
+        "credited": credited - max(0.0, remaining),
+        "capped": elapsed > OFFLINE_PROGRESS_MAX_SECONDS,
+        "earned": max(0.0, earned),
+        "collapsed": collapsed,
+        "reward": reward,
+        "stratum_before": start_stratum,
+        "stratum_after": int(game.get("time_stratum", 0)),
+    }
 
-    if game.get("motivation_unlocked", False) and MOTIVATION_REGEN_RATE > 0:
-        cap = motivation_capacity()
-        current = game.get("motivation", cap)
-        regen = MOTIVATION_REGEN_RATE * delta
-        if regen > 0 and current < cap:
-            set_motivation(current + regen)
-    
-    auto_ready = auto_work_allowed()
-    if auto_ready and not wake_timer_blocked():
-        gain, eff_delay = compute_gain_and_delay(auto=True)
-        work_timer += delta
-        if work_timer >= eff_delay:
-            perform_work(gain, eff_delay, manual=False)
-    process_auto_buyers()
-    if refresh_knowledge_flags():
-        save_game()
+
+def show_offline_progress_summary(summary):
+    if not summary:
+        return
+    lines = [f"You were away for {format_duration(summary['elapsed'])}."]
+    if summary.get("capped"):
+        lines.append(
+            f"Offline progress is capped at {format_duration(OFFLINE_PROGRESS_MAX_SECONDS)}."
+        )
+    if summary.get("earned", 0) > 0:
+        lines.append(f"Auto-work earned {format_currency(summary['earned'])} while you were gone.")
+    if summary.get("collapsed"):
+        lines.append(
+            f"The escape window closed after {format_duration(summary['credited'])}: "
+            f"recovered {format_number(summary['reward'])} {STABILITY_CURRENCY_NAME}."
+        )
+    if TIME_STRATA and summary.get("stratum_after", 0) > summary.get("stratum_before", 0):
+        label = TIME_STRATA[summary["stratum_after"]].get("label", "")
+        lines.append(f"Time flow advanced to the {label} stratum.")
+    lines.append("")
+    lines.append("Press any key to continue.")
+    tmp = boxed_lines(lines, title=" While You Were Away ", pad_top=1, pad_bottom=1)
+    render_frame(tmp)
+    wait_for_any_keypress(timeout=8.0)
 
 
 def get_time_velocity_multiplier_from_upgrades():
@@ -5220,10 +5560,7 @@ def timeflow_display_unlocked():
 
 
 def timeflow_active():
-    return bool(
-        game.get("wake_timer_infinite", False)
-        and not game.get("needs_stability_reset", False)
-    )
+    return bool(game.wake_timer_infinite and not game.needs_stability_reset)
 
 
 def get_timebond_level():
@@ -5355,14 +5692,14 @@ def guide_hotkey_hint():
 
 
 def compute_escape_vector_state():
-    if not ESCAPE_MODE or not isinstance(game, dict):
+    if not ESCAPE_MODE or not isinstance(game, MutableMapping):
         return None
     total_layers = max(1, len(LAYER_FLOW) - 1)
     current_layer = max(0, min(game.get("layer", 0), total_layers))
     layer_ratio = current_layer / total_layers if total_layers else 0.0
     rpg_floor = None
     rpg_data = game.get("rpg_data") or {}
-    if isinstance(rpg_data, dict):
+    if isinstance(rpg_data, MutableMapping):
         rpg_floor = max(rpg_data.get("floor", 0), rpg_data.get("max_floor", 0))
         if rpg_floor <= 0:
             rpg_floor = None
@@ -5621,107 +5958,219 @@ def buy_tree_upgrade(upgrades, idx, *, auto=False, save=True):
     return True
 
 
-def calculate_inspiration(money_since_reset):
-    normalized = money_since_reset / 100_000
-    base_gain = math.floor(((normalized**0.35) * math.log(normalized + 1, 1.5)))
-    rate_mult = 1.0
-    final_mult = 1.0
-    for entry in game.get("inspiration_upgrades", []):
-        upg_id, level = (
-            (entry.get("id"), entry.get("level", 1))
-            if isinstance(entry, dict)
-            else (entry, 1)
-        )
-        u = next((x for x in INSPIRE_UPGRADES if x["id"] == upg_id), None)
-        if not u:
-            continue
-        base_val = float(u.get("base_value", u.get("value", 1)))
-        val_mult = float(u.get("value_mult", 1))
-        val = base_val * (val_mult ** max(0, (level - 1)))
-        if u["type"] == "inspire_rate":
-            rate_mult *= val
-        elif u["type"] == "inspire_mult":
-            final_mult *= val
-    total = int(base_gain * rate_mult * final_mult)
-    gain_mod = get_challenge_modifier("inspiration_gain_mult")
-    if isinstance(gain_mod, (int, float)) and gain_mod > 0:
-        total = int(max(0, round(total * gain_mod)))
-    total = int(max(0, round(total * escape_multiplier())))
-    return total
+INSPIRATION_MONEY_SCALE = 100_000
+CONCEPT_MONEY_SCALE = 400_000
+# (money scale, power, log base) of the x**power * log(x + 1) gain curves.
+INSPIRATION_CURVE = (INSPIRATION_MONEY_SCALE, 0.35, 1.5)
+CONCEPT_CURVE = (CONCEPT_MONEY_SCALE, 0.42, 1.25)
+_MONEY_THRESHOLD_CACHE = {}
+_MONEY_THRESHOLD_CACHE_MAX = 512
 
 
-def calculate_concepts(money_since_reset):
+def _curve_growth(curve, normalized):
+    _, power, log_base = curve
+    return (normalized ** power) * bignum.log(normalized + 1, log_base)
+
+
+def _curve_base_gain(curve, money_since_reset, scale=1.0):
     if money_since_reset <= 0:
         return 0
-    normalized = money_since_reset / 400_000
-    growth_curve = (normalized ** 0.42) * math.log(normalized + 1, 1.25)
+    growth_curve = _curve_growth(curve, money_since_reset / curve[0])
+    return max(0, math.floor(growth_curve * scale))
+
+
+def inspiration_gain_multipliers():
+    effects = upgrade_effect_totals()
+    gain_mod = get_challenge_modifier("inspiration_gain_mult")
+    if not (isinstance(gain_mod, (int, float)) and gain_mod > 0):
+        gain_mod = None
+    return effects["inspire_rate_mult"] * effects["inspire_final_mult"], gain_mod, escape_multiplier()
+
+
+def _finalize_inspiration_gain(base_gain, mult, gain_mod, escape_mult):
+    total = bignum.whole(bignum.mul(base_gain, mult))
+    if gain_mod is not None:
+        total = bignum.whole(max(0, round(total * gain_mod)))
+    return bignum.whole(max(0, round(total * escape_mult)))
+
+
+def calculate_inspiration(money_since_reset):
+    return _finalize_inspiration_gain(
+        _curve_base_gain(INSPIRATION_CURVE, money_since_reset), *inspiration_gain_multipliers()
+    )
+
+
+def concept_base_scale():
     reset_bonus = max(1.0, (1 + game.get("concept_resets", 0)) ** 1.12)
     synergy_bonus = 1.0 + 0.08 * max(0, game.get("inspiration_resets", 0))
-    base_gain = max(0, math.floor(growth_curve * reset_bonus * synergy_bonus))
-    rate_mult = 1.0
-    final_mult = 1.0
-    for entry in game.get("concept_upgrades", []):
-        upg_id, level = (
-            (entry.get("id"), entry.get("level", 1))
-            if isinstance(entry, dict)
-            else (entry, 1)
-        )
-        u = next((x for x in CONCEPT_UPGRADES if x["id"] == upg_id), None)
-        if not u:
-            continue
-        base_val = float(u.get("base_value", u.get("value", 1)))
-        val_mult = float(u.get("value_mult", 1))
-        val = base_val * (val_mult ** max(0, (level - 1)))
-        if u["type"] == "concept_rate":
-            rate_mult *= val
-        elif u["type"] == "concept_mult":
-            final_mult *= val
-            
-                                                        
+    return reset_bonus * synergy_bonus
+
+
+def concept_base_gain(money_since_reset, scale=None):
+    if scale is None:
+        scale = concept_base_scale()
+    return _curve_base_gain(CONCEPT_CURVE, money_since_reset, scale)
+
+
+def concept_gain_multipliers():
+    effects = upgrade_effect_totals()
+    final_mult = effects["concept_final_mult"]
     if game.get("layer", 0) >= 2:
         signal_bonus = max(0.0, get_resonance_efficiency())
         final_mult *= 1.0 + signal_bonus
-        
-    total = int(base_gain * rate_mult * final_mult)
     gain_mod = get_challenge_modifier("concept_gain_mult")
-    if isinstance(gain_mod, (int, float)) and gain_mod > 0:
-        total = int(max(0, round(total * gain_mod)))
-    total = int(max(0, round(total * escape_multiplier())))
-    return total
+    if not (isinstance(gain_mod, (int, float)) and gain_mod > 0):
+        gain_mod = None
+    return effects["concept_rate_mult"] * final_mult, gain_mod, escape_multiplier()
 
 
-def predict_next_inspiration_point():
-    current_money = game.get("money_since_reset", 0)
-    current_insp = calculate_inspiration(current_money)
-    next_insp = current_insp + 1
-    target_money = ((next_insp - 1) * 25) ** (1 / 0.4)
-    remaining = round(max(target_money - current_money, 0), 2)
-    return remaining
+def _finalize_concept_gain(base_gain, mult, gain_mod, escape_mult):
+    total = bignum.whole(bignum.mul(base_gain, mult))
+    if gain_mod is not None:
+        total = bignum.whole(max(0, round(total * gain_mod)))
+    return bignum.whole(max(0, round(total * escape_mult)))
 
 
-def predict_next_concept_point():
-    current_money = game.get("money_since_reset", 0)
-    current_conc = calculate_concepts(current_money)
-    target = current_conc + 1
-    if target <= 0:
-        return 0
-    if calculate_concepts(current_money) >= target:
+def calculate_concepts(money_since_reset):
+    if money_since_reset <= 0:
         return 0
-    low = int(current_money)
-    high = max(low + 1, 1_000_000)
-    cap = 10**18
-    while calculate_concepts(high) < target and high < cap:
-        high = min(high * 2, cap)
-    lo = low + 1
-    hi = high
-    while lo < hi:
+    return _finalize_concept_gain(
+        concept_base_gain(money_since_reset), *concept_gain_multipliers()
+    )
+
+
+def _money_for_base(curve, base_gain, scale=1.0):
+    """Smallest money_since_reset whose base gain on ``curve`` reaches ``base_gain``.
+
+    Depends only on the curve and the reset bracket (``scale``), so results
+    are memoized and the side panels stop re-solving the curve every frame.
+    """
+    key = (curve, base_gain, scale)
+    cached = _MONEY_THRESHOLD_CACHE.get(key)
+    if cached is not None:
+        return cached
+    money_scale, power, log_base = curve
+    goal = base_gain / scale
+    lo, hi = 0.0, 1.0
+    if goal > 10:
+        # The log factor barely moves, so a few fixed-point rounds of
+        # x = (goal / log)^(1/power) land close; bracketing that guess
+        # saves galloping up from 1 through hundreds of doublings.
+        guess = 1.0
+        for _ in range(6):
+            exponent = (bignum.log10(goal) - math.log10(bignum.log(guess + 1, log_base))) / power
+            guess = bignum.from_log10(exponent)
+        lo, hi = guess / 2.0, bignum.mul(guess, 2.0)
+        while lo > 0 and _curve_growth(curve, lo) >= goal:
+            lo, hi = lo / 2.0, lo
+    while _curve_growth(curve, hi) < goal:
+        lo, hi = hi, bignum.mul(hi, 2.0)
+    for _ in range(200):
+        mid = (lo + hi) / 2.0
+        if mid <= lo or mid >= hi:
+            break
+        if _curve_growth(curve, mid) >= goal:
+            hi = mid
+        else:
+            lo = mid
+    money = max(1, math.ceil(bignum.mul(hi, money_scale)))
+    # Settle float rounding against the exact floor() used by the base gain.
+    for _ in range(4):
+        if money > 1 and _curve_base_gain(curve, money - 1, scale) >= base_gain:
+            money -= 1
+        elif _curve_base_gain(curve, money, scale) < base_gain:
+            money += 1
+        else:
+            break
+    if len(_MONEY_THRESHOLD_CACHE) >= _MONEY_THRESHOLD_CACHE_MAX:
+        _MONEY_THRESHOLD_CACHE.clear()
+    _MONEY_THRESHOLD_CACHE[key] = money
+    return money
+
+
+def _next_base_for_gain(base_now, target, estimate, finalize):
+    """Smallest base gain whose finalized gain reaches ``target``.
+
+    The finalized gain is monotone in the base gain. Bracket the linear
+    ``estimate`` with steps sized to the float resolution there: bases
+    closer than one ulp finalize identically, so neither the gallop nor
+    the bisection needs to go finer than that.
+    """
+    lo = base_now
+    hi = max(base_now + 1, int(estimate))
+    resolution = max(1, int(math.ulp(float(hi))))
+    step = resolution
+    if finalize(hi) >= target:
+        while hi - lo > step:
+            probe = hi - step
+            if finalize(probe) < target:
+                lo = probe
+                break
+            hi = probe
+            step *= 2
+    else:
+        while finalize(hi) < target:
+            lo = hi
+            hi += step
+            step *= 2
+    while hi - lo > resolution:
         mid = (lo + hi) // 2
-        if calculate_concepts(mid) >= target:
+        if finalize(mid) >= target:
             hi = mid
         else:
-            lo = mid + 1
-    remaining = max(lo - current_money, 0)
-    return round(remaining, 2)
+            lo = mid
+    return hi
+
+
+def _big_point_remaining(curve, money, gain):
+    """Money to the next point once the balance or gain leaves float range.
+
+    A point there only moves the gain by about one float ulp, so treat it
+    as a relative step and turn that into money with the curve's
+    elasticity, d ln(gain) / d ln(money) = power + x / ((x + 1) ln(x + 1)).
+    """
+    money_scale, power, _ = curve
+    step = max(2.0 ** -52, 1.0 / max(1.0, float(gain)))
+    normalized = money / money_scale
+    if bignum.is_big(normalized):
+        elasticity = power + 1.0 / bignum.log(normalized)
+    else:
+        elasticity = power + normalized / ((normalized + 1.0) * math.log1p(normalized))
+    return bignum.mul(money, step / elasticity)
+
+
+def _predict_next_point(curve, scale, multipliers, finalize):
+    current_money = game.get("money_since_reset", 0)
+    mult, gain_mod, escape_mult = multipliers
+    base_now = _curve_base_gain(curve, current_money, scale)
+    target = finalize(base_now, mult, gain_mod, escape_mult) + 1
+    effective = mult * (gain_mod if gain_mod is not None else 1.0) * escape_mult
+    if effective <= 0:
+        return 0
+    estimate = target / effective
+    if bignum.is_big(current_money) or not estimate < bignum.PROMOTE_AT:
+        return _big_point_remaining(curve, max(1, current_money), target)
+    base = _next_base_for_gain(
+        base_now, target, estimate, lambda b: finalize(b, mult, gain_mod, escape_mult)
+    )
+    remaining = _money_for_base(curve, base, scale) - current_money
+    if remaining <= 0:
+        # Only near float range: the threshold rounded onto the balance itself.
+        remaining = _big_point_remaining(curve, max(1, current_money), target)
+    # Cents only mean something below 2**53; round() on huge floats is slow.
+    return round(remaining, 2) if remaining < 2**53 else remaining
+
+
+def predict_next_inspiration_point():
+    return _predict_next_point(
+        INSPIRATION_CURVE, 1.0, inspiration_gain_multipliers(), _finalize_inspiration_gain
+    )
+
+
+def predict_next_concept_point():
+    return _predict_next_point(
+        CONCEPT_CURVE, concept_base_scale(), concept_gain_multipliers(), _finalize_concept_gain
+    )
 
 
 def wipe_to_inspiration_baseline(state):
@@ -5737,6 +6186,7 @@ def wipe_to_inspiration_baseline(state):
             "motivation": config.MOTIVATION_MAX,
         }
     )
+    invalidate_upgrade_effects()
 
 
 def reset_for_inspiration():
@@ -5791,6 +6241,7 @@ def reset_for_inspiration():
         set_motivation(motivation_capacity())
     check_challenges("inspiration")
     save_game()
+    flush_save()
     done_msg = boxed_lines(
         [f"Gained {Fore.LIGHTYELLOW_EX}{gained}{Style.RESET_ALL} {corridor_currency}."],
         title=f" {corridor_name} Gained ",
@@ -5822,6 +6273,7 @@ def wipe_to_concept_baseline(state):
             "motivation_strength_mult": 1.0,
         }
     )
+    invalidate_upgrade_effects()
 
 
 def reset_for_concepts():
@@ -5880,6 +6332,7 @@ def reset_for_concepts():
     apply_inspiration_effects()
     check_challenges("concept")
     save_game()
+    flush_save()
     done_msg = boxed_lines(
         [f"Gained {Fore.CYAN}{gained}{Style.RESET_ALL} {archive_currency}."],
         title=f" {archive_name} Gained ",
@@ -6039,16 +6492,9 @@ def buy_wake_timer_upgrade(upg):
 def upgrade_is_visible(upgrade):
     if not upgrade:
         return False
-    uid = upgrade.get("id")
-    owned_ids = set(game.get("owned", []))
-    auto_ready = game.get("auto_work_unlocked", False)
-    if (
-        upgrade.get("type") in AUTO_ONLY_UPGRADE_TYPES
-        and uid not in owned_ids
-        and not auto_ready
-    ):
-        return False
-    return True
+    if upgrade.get("type") not in AUTO_ONLY_UPGRADE_TYPES or game.auto_work_unlocked:
+        return True
+    return upgrade.get("id") in game.owned
 
 
 def open_upgrade_menu():
@@ -6216,7 +6662,7 @@ def open_upgrade_menu():
                     continue
 
 
-def buy_idx_upgrade(upg):
+def purchase_idx_upgrade(upg):
     uid = upg["id"]
     game.setdefault("owned", [])
     game.setdefault("upgrade_levels", {})
@@ -6232,6 +6678,7 @@ def buy_idx_upgrade(upg):
         game["money"] -= scaled_cost
         current_level += 1
         game["upgrade_levels"][uid] = current_level
+        invalidate_upgrade_effects()
         if uid not in game["owned"]:
             game["owned"].append(uid)
         if not game.get("upgrades_unlocked", False):
@@ -6239,7 +6686,13 @@ def buy_idx_upgrade(upg):
         mark_known(f"upgrade_{uid}")
         if upg.get("type") == "unlock_rpg" and current_level > 0:
             game["rpg_unlocked"] = True
-        msg = f"Purchased {upg['name']} (Lv {current_level}/{max_level})."
+        return True, f"Purchased {upg['name']} (Lv {current_level}/{max_level})."
+    return False, msg
+
+
+def buy_idx_upgrade(upg):
+    uid = upg["id"]
+    _, msg = purchase_idx_upgrade(upg)
     tmp = boxed_lines([msg], title=" UPGRADE BAY ", pad_top=1, pad_bottom=1)
     render_frame(tmp)
     # Try to animate the purchased upgrade (cosmetic)
@@ -6359,12 +6812,18 @@ def open_blackjack_layer():
     listener_enabled = False
     clear_screen()
 
-    starting_money = float(game.get("money", 0.0))
+    # Blackjack works in floats: stake at most a float-sized slice of a
+    # BigNum balance and settle the difference, so the rest is untouched.
+    balance = game.get("money", 0.0)
+    starting_money = min(float(balance), bignum.PROMOTE_AT)
     try:
         print("Entering blackjack casino...\n")
         print(f"Carrying {format_currency(starting_money)} from the main game.\n")
         new_money = blackjack.run_blackjack(starting_money)
-        game["money"] = max(0.0, float(new_money))
+        if bignum.is_big(balance):
+            game["money"] = max(0.0, bignum.add(balance, float(new_money) - starting_money))
+        else:
+            game["money"] = max(0.0, float(new_money))
         save_game()
     except Exception as e:
         err_lines = [
@@ -6382,20 +6841,41 @@ def open_blackjack_layer():
         clear_screen()
 
 
+def pump_key_queue():
+    """Move the next queued key into the KEY_PRESSED slot once it is free.
+
+    Only this function fills the slot, and only while it is empty, so a
+    consumer clearing KEY_PRESSED can never race a key away.
+    """
+    global KEY_PRESSED
+    if KEY_PRESSED is None and KEY_QUEUE:
+        with _KEY_SLOT_LOCK:
+            if KEY_PRESSED is None and KEY_QUEUE:
+                KEY_PRESSED = KEY_QUEUE.popleft()
+    return KEY_PRESSED
+
+
+def enqueue_key(key):
+    if key:
+        KEY_QUEUE.append(key)
+    pump_key_queue()
+
+
 def key_listener():
-    global KEY_PRESSED, running, listener_enabled
+    global running, listener_enabled
     if msvcrt is not None and os.name == "nt":
         while running:
             if not listener_enabled:
                 time.sleep(0.02)
                 continue
-            if msvcrt.kbhit():
+            while msvcrt.kbhit():
                 ch = msvcrt.getwch()
                 if ch:
                     try:
-                        KEY_PRESSED = ch.lower()
-                    except:
-                        KEY_PRESSED = None
+                        enqueue_key(ch.lower())
+                    except Exception:
+                        pass
+            pump_key_queue()
             time.sleep(0.02)
     else:
         import tty, termios
@@ -6408,8 +6888,11 @@ def key_listener():
                 if not listener_enabled:
                     time.sleep(0.02)
                     continue
-                r, _, _ = select.select([sys.stdin], [], [], 0)
-                if r:
+                # Block until input arrives; only poll quickly while queued
+                # keys are still waiting for the slot to free up.
+                timeout = 0.01 if KEY_QUEUE else KEY_LISTENER_IDLE_TIMEOUT
+                r, _, _ = select.select([sys.stdin], [], [], timeout)
+                if r and listener_enabled:
                     ch = sys.stdin.read(1)
                     if ch:
                         if ch == "\x1b":
@@ -6423,10 +6906,10 @@ def key_listener():
                                     rest += more
                                 else:
                                     break
-                            KEY_PRESSED = ch + rest
+                            enqueue_key(ch + rest)
                         else:
-                            KEY_PRESSED = ch.lower()
-                time.sleep(0.02)
+                            enqueue_key(ch.lower())
+                pump_key_queue()
         finally:
             termios.tcsetattr(fd, termios.TCSADRAIN, old)
 
@@ -6464,6 +6947,81 @@ def cycle_screen(current_screen, direction):
     return tabs[idx]
 
 
+_PANEL_CACHE = {}
+
+
+def retained_panel(name, inputs, build):
+    """Return what ``build()`` produced for ``name`` until ``inputs`` changes."""
+    entry = _PANEL_CACHE.get(name)
+    if entry is not None and entry[0] == inputs:
+        return entry[1]
+    result = build()
+    _PANEL_CACHE[name] = (inputs, result)
+    return result
+
+
+def invalidate_panels():
+    _PANEL_CACHE.clear()
+
+
+def tree_board_inputs(upgrades, page_key):
+    meta = tree_catalogue_meta(upgrades)
+    applied = tuple(
+        (entry.get("id"), entry.get("level", 1)) if isinstance(entry, dict) else (entry, 1)
+        for entry in game.get(meta["applied_key"], [])
+    )
+    return (
+        get_term_size(),
+        config.SCIENTIFIC_THRESHOLD_EXPONENT,
+        meta["pool_currency"],
+        meta["currency_suffix"],
+        game.get(meta["holdings_key"], 0),
+        game.get(page_key, 0),
+        applied,
+        estimate_progress(game) if upgrades is CONCEPT_UPGRADES else None,
+    )
+
+
+def build_tree_board(upgrades, get_info_fn, page_key):
+    visible_lines, footer, page_count = retained_panel(
+        ("tree", page_key),
+        tree_board_inputs(upgrades, page_key),
+        lambda: build_tree_lines(upgrades, get_info_fn, page_key),
+    )
+    game[f"{page_key}_pages"] = max(1, page_count)
+    return visible_lines, footer, page_count
+
+
+def _ljust_with_buffer(text, box_w, pad_left):
+    content_w = max(0, box_w - pad_left)
+    t = text
+    if visible_len(t) > content_w:
+        t = ansi_visible_slice(t, 0, content_w)
+    vis = visible_len(t)
+    pad_right = max(0, content_w - vis)
+    return " " * pad_left + t + " " * pad_right
+
+
+def layout_side_column(lines, box_w, pad_left, titles):
+    """Wrap a side panel to its column and pad every row to ``box_w``."""
+    content_w = max(0, box_w - pad_left)
+    wrapped = []
+    for entry in lines:
+        if not entry:
+            wrapped.append("")
+        elif content_w <= 0 or entry in titles:
+            wrapped.append(entry)
+        else:
+            wrapped.extend(wrap_visible_text(entry, content_w) or [""])
+    rows = []
+    for row in wrapped:
+        if row in titles:
+            rows.append(" " * pad_left + ansi_center(row, content_w))
+        else:
+            rows.append(_ljust_with_buffer(row, box_w, pad_left))
+    return tuple(rows)
+
+
 def render_ui(screen="work"):
     global last_render, last_size, view_offset_x, view_offset_y, Fore
     term_w, term_h = get_term_size()
@@ -6543,7 +7101,7 @@ def render_ui(screen="work"):
                 )
             top_left_lines.append(f"[1] Open {corridor_name} board")
             if screen == "inspiration":
-                visible_lines, footer, _ = build_tree_lines(
+                visible_lines, footer, _ = build_tree_board(
                     INSPIRE_UPGRADES, get_inspire_info, "insp_page"
                 )
                 top_left_lines += [
@@ -6620,7 +7178,7 @@ def render_ui(screen="work"):
                     f"{Fore.LIGHTBLACK_EX}{gate_hint}{Style.RESET_ALL}"
                 )
             if screen == "concepts":
-                visible_lines, footer, _ = build_tree_lines(
+                visible_lines, footer, _ = build_tree_board(
                     CONCEPT_UPGRADES, get_concept_info, "concept_page"
                 )
                 bottom_left_lines += [
@@ -6654,7 +7212,7 @@ def render_ui(screen="work"):
             if screen == "automation":
                 exchange_panel = build_signal_exchange_panel()
                 auto_buyer_panel = build_auto_buyer_panel()
-                auto_lines, auto_footer, _ = build_tree_lines(
+                auto_lines, auto_footer, _ = build_tree_board(
                     AUTOMATION_UPGRADES, get_automation_info, "automation_page"
                 )
                 bottom_left_lines += [
@@ -6825,77 +7383,32 @@ def render_ui(screen="work"):
     left_pad = 2
     right_pad = 2
 
-    def _ljust_with_buffer(text, box_w, pad_left):
-        content_w = max(0, box_w - pad_left)
-        t = text
-        if visible_len(t) > content_w:
-            t = ansi_visible_slice(t, 0, content_w)
-        vis = visible_len(t)
-        pad_right = max(0, content_w - vis)
-        return " " * pad_left + t + " " * pad_right
-
-    left_content_w = max(0, left_w - left_pad)
-    right_content_w = max(0, right_w - left_pad)
-
-    def wrap_panel_lines(lines, width, exempt_titles):
-        if width <= 0:
-            return list(lines)
-        wrapped = []
-        for entry in lines:
-            if not entry:
-                wrapped.append("")
-                continue
-            if entry in exempt_titles:
-                wrapped.append(entry)
-                continue
-            segments = wrap_visible_text(entry, width)
-            if not segments:
-                wrapped.append("")
-            else:
-                wrapped.extend(segments)
-        return wrapped
-
-    title_set = {t for t in (insp_title, insp_tree_title, conc_title, conc_tree_title) if t}
-    top_left_lines = wrap_panel_lines(top_left_lines, left_content_w, title_set)
-    bottom_left_lines = wrap_panel_lines(bottom_left_lines, right_content_w, title_set)
-
-    while len(top_left_lines) < inner_target:
-        top_left_lines.append("")
-    while len(bottom_left_lines) < inner_target:
-        bottom_left_lines.append("")
-    while len(middle_lines) < inner_target:
-        middle_lines.insert(0, "")
-
-    column_height = max(inner_target, len(top_left_lines), len(middle_lines), len(bottom_left_lines))
-
-    def pad_column(lines, target, pad_front=False):
-        while len(lines) < target:
-            if pad_front:
-                lines.insert(0, "")
-            else:
-                lines.append("")
-
-    pad_column(top_left_lines, column_height)
-    pad_column(bottom_left_lines, column_height)
-    pad_column(middle_lines, column_height, pad_front=True)
-
-    combined_lines = []
-    for idx in range(column_height):
-        l = top_left_lines[idx]
-        m = middle_lines[idx]
-        r = bottom_left_lines[idx]
-        if l in (insp_title, insp_tree_title, conc_title, conc_tree_title):
-            left_part = " " * left_pad + ansi_center(l, left_content_w)
-        else:
-            left_part = _ljust_with_buffer(l, left_w, left_pad)
-        mid_part = ansi_center(m, mid_w)
-        if r in (insp_title, insp_tree_title, conc_title, conc_tree_title):
-            right_part = " " * left_pad + ansi_center(r, right_content_w)
-        else:
-            right_part = _ljust_with_buffer(r, right_w, left_pad)
-        combined_lines.append(
-            left_part + " " * right_pad + mid_part + " " * right_pad + right_part
-        )
+    # Side columns only change when their text or geometry does; the middle
+    # column (desk, counters, work bar) is laid out fresh every frame.
+    title_set = frozenset(
+        t for t in (insp_title, insp_tree_title, conc_title, conc_tree_title) if t
+    )
+    left_rows = retained_panel(
+        "left_column",
+        (tuple(top_left_lines), left_w, left_pad, title_set),
+        lambda: layout_side_column(top_left_lines, left_w, left_pad, title_set),
+    )
+    right_rows = retained_panel(
+        "right_column",
+        (tuple(bottom_left_lines), right_w, left_pad, title_set),
+        lambda: layout_side_column(bottom_left_lines, right_w, left_pad, title_set),
+    )
+
+    column_height = max(inner_target, len(left_rows), len(middle_lines), len(right_rows))
+    left_rows = list(left_rows) + [" " * left_w] * (column_height - len(left_rows))
+    right_rows = list(right_rows) + [" " * right_w] * (column_height - len(right_rows))
+    middle_lines = [""] * (column_height - len(middle_lines)) + middle_lines
+
+    gap = " " * right_pad
+    combined_lines = [
+        left_part + gap + ansi_center(m, mid_w) + gap + right_part
+        for left_part, m, right_part in zip(left_rows, middle_lines, right_rows)
+    ]
 
     max_scroll = max(0, len(combined_lines) - inner_target)
     view_offset_y = max(0, min(view_offset_y, max_scroll))
@@ -6932,11 +7445,15 @@ def render_ui(screen="work"):
         visible_lines = [banner_line] + visible_lines
     if len(visible_lines) > term_height:
         visible_lines = visible_lines[-term_height:]
-    frame = "\033[H" + "\n".join(visible_lines)
-    if frame != last_render:
-        sys.stdout.write(frame)
-        sys.stdout.flush()
-        last_render = frame
+    if FRAME_PROFILER.enabled:
+        overlay = pad_visible_line(
+            f"{Fore.LIGHTBLACK_EX}{FRAME_PROFILER.overlay_line()}{Style.RESET_ALL}", term_width
+        )
+        if len(visible_lines) >= term_height:
+            visible_lines[0] = overlay
+        else:
+            visible_lines.insert(0, overlay)
+    present_frame(visible_lines)
 
 
 def typewriter_message(lines, title, speed=0.03):
@@ -7198,7 +7715,7 @@ def build_breach_door_lines():
 
 def rpg_log(msg):
     msg = escape_text(msg)
-    rpg = ensure_rpg_state()
+    rpg = game.get("rpg_data") or ensure_rpg_state()
     log = rpg.get("log", [])
     log.append(msg)
     if len(log) > RPG_LOG_MAX:
@@ -7260,8 +7777,8 @@ def resolve_secret_entry(rpg):
     handle_rpg_room_event(rpg, room)
 
 
-def build_secret_chamber_layout(payload):
-    payload = payload or random.choice(RPG_SECRET_ROOM_TYPES)
+def build_secret_chamber_layout(payload, rng=random):
+    payload = payload or rng.choice(RPG_SECRET_ROOM_TYPES)
     def _room(r_type, visited=False, cleared=False, extra=None):
         data = {"type": r_type, "visited": visited, "cleared": cleared}
         if extra:
@@ -7300,7 +7817,7 @@ def enter_secret_room(rpg, payload, seam_coords, seam_room=None):
     origin_map = rpg.get("map")
     if not origin_map:
         return
-    layout, start, variant, payload = build_secret_chamber_layout(payload)
+    layout, start, variant, payload = build_secret_chamber_layout(payload, rng=rpg_rng(rpg, "loot"))
     rpg["secret_origin"] = {
         "map": origin_map,
         "variant": copy.deepcopy(rpg.get("maze_variant")),
@@ -7566,7 +8083,7 @@ def calculate_ng_gain_from_gold(gold):
     return max(1, capped)
 
 
-def choose_maze_variant(floor):
+def choose_maze_variant(floor, rng=random):
     pool = [copy.deepcopy(v) for v in RPG_MAZE_VARIANTS if floor >= v.get("min_floor", 1)]
     if not pool:
         pool = [copy.deepcopy(v) for v in RPG_MAZE_VARIANTS]
@@ -7575,7 +8092,7 @@ def choose_maze_variant(floor):
         base = max(0.05, float(entry.get("weight", 1.0)))
         floor_bias = max(0, floor - entry.get("min_floor", 1)) * 0.05
         weights.append(base * (1.0 + floor_bias))
-    return random.choices(pool, weights=weights, k=1)[0]
+    return rng.choices(pool, weights=weights, k=1)[0]
 
 
 def floor_theme_for_floor(floor):
@@ -7627,16 +8144,16 @@ SHOP_MAX_ITEMS_PER_VISIT = 3
 SHOP_PURCHASE_LIMIT = 2
 
 
-def maybe_attach_side_chamber(layout, floor):
-    if not layout or random.random() >= SIDE_CHAMBER_CHANCE:
+def maybe_attach_side_chamber(layout, floor, rng=random):
+    if not layout or rng.random() >= SIDE_CHAMBER_CHANCE:
         return layout, None
     height = len(layout)
     width = len(layout[0]) if layout else 0
     annex_width = 2 if width < 10 else 3
     feature_pool = ["treasure", "secret", "elite", "healer"]
-    random.shuffle(feature_pool)
+    rng.shuffle(feature_pool)
     feature_rows = {}
-    for idx, row_idx in enumerate(random.sample(range(height), k=min(len(feature_pool), height))):
+    for idx, row_idx in enumerate(rng.sample(range(height), k=min(len(feature_pool), height))):
         feature_rows[row_idx] = feature_pool[idx % len(feature_pool)]
     for row_idx, row in enumerate(layout):
         new_cells = []
@@ -7656,7 +8173,7 @@ def maybe_attach_side_chamber(layout, floor):
                         "cleared": cell_type == "empty",
                         "annex": True,
                     }
-                elif random.random() < 0.35:
+                elif rng.random() < 0.35:
                     cell = {
                         "type": "enemy",
                         "visited": False,
@@ -7668,7 +8185,7 @@ def maybe_attach_side_chamber(layout, floor):
     return layout, {"width": annex_width}
 
 
-def select_floor_modifier(floor):
+def select_floor_modifier(floor, rng=random):
     eligible = []
     for entry in RPG_FLOOR_MODIFIERS:
         min_floor = entry.get("min_floor", 1)
@@ -7679,7 +8196,7 @@ def select_floor_modifier(floor):
     if not eligible:
         return None
     weights = [max(0.05, float(e.get("weight", 1.0))) for e in eligible]
-    picked = copy.deepcopy(random.choices(eligible, weights=weights, k=1)[0])
+    picked = copy.deepcopy(rng.choices(eligible, weights=weights, k=1)[0])
     return picked
 
 
@@ -7692,7 +8209,7 @@ def ensure_floor_modifier(rpg):
     current = rpg.get("floor_modifier") if rpg.get("floor_modifier_floor") == floor else None
     if current:
         return current
-    picked = select_floor_modifier(floor)
+    picked = select_floor_modifier(floor, rng=rpg_floor_rng(rpg, floor, "modifier"))
     rpg["floor_modifier"] = picked
     rpg["floor_modifier_floor"] = floor
     if picked:
@@ -7742,7 +8259,7 @@ def _soften_trap_damage(rpg, dmg):
     return max(1, int(math.ceil(dmg * factor * trap_mult)))
 
 
-def _limit_room_spawns(layout, room_type, max_allowed):
+def _limit_room_spawns(layout, room_type, max_allowed, rng=random):
     coords = []
     for y, row in enumerate(layout):
         for x, room in enumerate(row):
@@ -7750,7 +8267,7 @@ def _limit_room_spawns(layout, room_type, max_allowed):
                 coords.append((y, x))
     if len(coords) <= max_allowed:
         return
-    random.shuffle(coords)
+    rng.shuffle(coords)
     for y, x in coords[max_allowed:]:
         layout[y][x] = {"type": "enemy", "visited": False, "cleared": False}
 
@@ -7771,7 +8288,7 @@ def _build_boss_floor_layout(floor):
     return layout, (0, 0)
 
 
-def _build_layout_for_variant(floor, variant):
+def _build_layout_for_variant(floor, variant, rng=random):
     if is_boss_floor(floor):
         return _build_boss_floor_layout(floor)
     width = max(3, int((variant or {}).get("width", RPG_MAP_WIDTH)))
@@ -7782,27 +8299,27 @@ def _build_layout_for_variant(floor, variant):
     for _y in range(height):
         row = []
         for _x in range(width):
-            typo = random.choices(options, weights=weights, k=1)[0]
+            typo = rng.choices(options, weights=weights, k=1)[0]
             row.append({"type": typo, "visited": False, "cleared": typo == "empty"})
         layout.append(row)
     center_y = height // 2
     center_x = width // 2
     layout[center_y][center_x] = {"type": "start", "visited": True, "cleared": True}
     candidates = [(y, x) for y in range(height) for x in range(width) if (y, x) != (center_y, center_x)]
-    exit_y, exit_x = random.choice(candidates)
+    exit_y, exit_x = rng.choice(candidates)
     exit_type = "boss" if is_boss_floor(floor) else "stairs"
     layout[exit_y][exit_x]["type"] = exit_type
     layout[exit_y][exit_x]["visited"] = False
     layout[exit_y][exit_x]["cleared"] = exit_type == "stairs"
     if not any(room["type"] in ("enemy", "elite") for row in layout for room in row):
-        backfill_y, backfill_x = random.choice(candidates)
+        backfill_y, backfill_x = rng.choice(candidates)
         layout[backfill_y][backfill_x]["type"] = "enemy"
         layout[backfill_y][backfill_x]["cleared"] = False
         layout[backfill_y][backfill_x]["visited"] = False
     area = width * height
     max_healers = max(1, min(3, area // 18 + 1))
-    _limit_room_spawns(layout, "healer", max_healers)
-    inject_secret_rooms(layout, floor)
+    _limit_room_spawns(layout, "healer", max_healers, rng=rng)
+    inject_secret_rooms(layout, floor, rng=rng)
     return layout, (center_y, center_x)
 
 
@@ -7842,18 +8359,22 @@ def generate_rpg_floor(rpg, variant=None, prepared_layout=None):
         label = f"{boss.get('name', 'Boss')} Arena"
         selected = {"id": "boss", "label": label, "color": "LIGHTMAGENTA_EX"}
     else:
-        selected = copy.deepcopy(variant) if variant else choose_maze_variant(floor)
+        selected = copy.deepcopy(variant) if variant else choose_maze_variant(
+            floor, rng=rpg_floor_rng(rpg, floor, "variant")
+        )
     if prepared_layout:
         base_layout, center = prepared_layout
         layout = copy.deepcopy(base_layout)
         center_y, center_x = center
     else:
-        layout, (center_y, center_x) = _build_layout_for_variant(floor, selected)
+        layout, (center_y, center_x) = _build_layout_for_variant(
+            floor, selected, rng=rpg_floor_rng(rpg, floor, "grid")
+        )
     annex_info = None
     if not is_boss_floor(floor):
-        layout, annex_info = maybe_attach_side_chamber(layout, floor)
-        if annex_info:
-            rpg_log("Side chamber attached to the east wall.")
+        layout, annex_info = maybe_attach_side_chamber(
+            layout, floor, rng=rpg_floor_rng(rpg, floor, "annex")
+        )
     height = len(layout)
     width = len(layout[0]) if layout else 0
     rpg["map"] = layout
@@ -7868,6 +8389,9 @@ def generate_rpg_floor(rpg, variant=None, prepared_layout=None):
         "color": theme.get("map_color") if theme else selected.get("color"),
     }
     rpg["pending_variant"] = None
+    prefetch_floor_plan(rpg, floor + 1)
+    if annex_info:
+        rpg_log("Side chamber attached to the east wall.")
     if is_boss_floor(floor):
         rpg_log(
             f"Boss arena ready: {selected.get('label', 'Boss Arena')} ({height}x{width})."
@@ -7878,7 +8402,7 @@ def generate_rpg_floor(rpg, variant=None, prepared_layout=None):
         )
 
 
-def inject_secret_rooms(layout, floor):
+def inject_secret_rooms(layout, floor, rng=random):
     if floor < RPG_MIN_SECRET_FLOOR:
         return
     if not layout:
@@ -7903,16 +8427,16 @@ def inject_secret_rooms(layout, floor):
             "visited": False,
             "cleared": False,
             "hidden": True,
-            "secret_payload": random.choice(RPG_SECRET_ROOM_TYPES),
+            "secret_payload": rng.choice(RPG_SECRET_ROOM_TYPES),
         }
 
     spawned = False
     for y, x in pool:
-        if random.random() <= SECRET_ROOM_CHANCE:
+        if rng.random() <= SECRET_ROOM_CHANCE:
             _spawn_secret(y, x)
             spawned = True
-    if not spawned and random.random() <= SECRET_ROOM_CHANCE:
-        y, x = random.choice(pool)
+    if not spawned and rng.random() <= SECRET_ROOM_CHANCE:
+        y, x = rng.choice(pool)
         _spawn_secret(y, x)
 
 
@@ -8032,11 +8556,68 @@ def build_rpg_map_lines(rpg):
     return lines
 
 
+_FLOOR_PLANS = {}
+_FLOOR_PLANS_PENDING = set()
+_FLOOR_PLANS_LOCK = threading.Lock()
+_FLOOR_PLANS_MAX = 4
+
+
+def build_floor_plan(rpg, floor, variant=None):
+    """Variant, base layout and reveal order for ``floor``.
+
+    Only the seed and NG+ cycle of ``rpg`` are read, so a plan built ahead
+    of time on a background thread matches one built at the stairs.
+    """
+    variant = copy.deepcopy(variant) if variant else choose_maze_variant(
+        floor, rng=rpg_floor_rng(rpg, floor, "variant")
+    )
+    layout, center = _build_layout_for_variant(floor, variant, rng=rpg_floor_rng(rpg, floor, "grid"))
+    return {
+        "variant": variant,
+        "layout": layout,
+        "center": center,
+        "sequence": _build_transition_sequence(layout, center),
+    }
+
+
+def _floor_plan_key(rpg, floor):
+    return (rpg.get("seed"), rpg.get("ng_plus", 0), floor)
+
+
+def _prefetch_floor_plan_worker(key):
+    seed, ng_plus, floor = key
+    plan = build_floor_plan({"seed": seed, "ng_plus": ng_plus}, floor)
+    with _FLOOR_PLANS_LOCK:
+        _FLOOR_PLANS_PENDING.discard(key)
+        while len(_FLOOR_PLANS) >= _FLOOR_PLANS_MAX:
+            _FLOOR_PLANS.pop(next(iter(_FLOOR_PLANS)))
+        _FLOOR_PLANS[key] = plan
+
+
+def prefetch_floor_plan(rpg, floor):
+    """Build the plan for ``floor`` on a daemon thread while the player explores."""
+    if HEADLESS or not isinstance(rpg.get("seed"), int):
+        return
+    key = _floor_plan_key(rpg, floor)
+    with _FLOOR_PLANS_LOCK:
+        if key in _FLOOR_PLANS or key in _FLOOR_PLANS_PENDING:
+            return
+        _FLOOR_PLANS_PENDING.add(key)
+    threading.Thread(target=_prefetch_floor_plan_worker, args=(key,), daemon=True).start()
+
+
+def take_floor_plan(rpg, floor):
+    with _FLOOR_PLANS_LOCK:
+        plan = _FLOOR_PLANS.pop(_floor_plan_key(rpg, floor), None)
+    return plan or build_floor_plan(rpg, floor)
+
+
 def begin_maze_reassembly(rpg, variant=None, duration=1.8):
     floor = rpg.get("floor", 1)
-    pending = copy.deepcopy(variant) if variant else choose_maze_variant(floor)
-    layout, center = _build_layout_for_variant(floor, pending)
-    sequence = _build_transition_sequence(layout, center)
+    plan = build_floor_plan(rpg, floor, variant) if variant else take_floor_plan(rpg, floor)
+    pending = plan["variant"]
+    layout, center = plan["layout"], plan["center"]
+    sequence = plan["sequence"]
     if not sequence:
         height = len(layout)
         width = len(layout[0]) if layout else 0
@@ -8239,13 +8820,15 @@ def attempt_climb_stairs(rpg=None):
 
 def resolve_secret_room(rpg, room):
     room["hidden"] = False
-    payload = room.get("secret_payload") or random.choice(RPG_SECRET_ROOM_TYPES)
+    payload = room.get("secret_payload") or rpg_rng(rpg, "loot").choice(RPG_SECRET_ROOM_TYPES)
     coords = tuple(rpg.get("player_pos", [0, 0]))
     enter_secret_room(rpg, payload, coords, seam_room=room)
 
 
 def start_rpg_combat(rpg, elite=False, custom_enemy=None):
-    enemy = custom_enemy or build_rpg_enemy(rpg.get("floor", 1), elite=elite, rpg=rpg)
+    enemy = custom_enemy or build_rpg_enemy(
+        rpg.get("floor", 1), elite=elite, rpg=rpg, rng=rpg_room_rng(rpg)
+    )
     enemy["elite"] = bool(enemy.get("elite") or elite)
     rpg["current_enemy"] = enemy
     rpg["state"] = "combat"
@@ -8257,11 +8840,14 @@ def start_rpg_combat(rpg, elite=False, custom_enemy=None):
     rpg_log(f"Encounter: {prefix}{enemy['name']} engaged.")
 
 
-def build_rpg_enemy(floor, elite=False, rpg=None):
+def build_rpg_enemy(floor, elite=False, rpg=None, rng=random):
     pool = [entry for entry in RPG_ENEMIES if floor >= entry.get("min_floor", 1) and floor <= entry.get("max_floor", RPG_FLOOR_CAP)]
     if not pool:
         pool = RPG_ENEMIES[:]
-    template = random.choice(pool)
+    return scale_rpg_enemy(rng.choice(pool), floor, elite=elite, rpg=rpg)
+
+
+def scale_rpg_enemy(template, floor, elite=False, rpg=None):
     modifier = active_floor_modifier(rpg)
     hp_mult = modifier.get("enemy_hp_mult", 1.0) if modifier else 1.0
     atk_mult = modifier.get("enemy_atk_mult", 1.0) if modifier else 1.0
@@ -8337,10 +8923,7 @@ def rpg_attack():
         rpg["state"] = "explore"
         return
     dmg = rpg.get("atk", RPG_PLAYER_START_ATK)
-    aura_data, _ = _active_aura_data(rpg)
-    trinket_bonus = (rpg.get("gear_trinket_bonus") or {}).get("crit_bonus", 0.0)
-    crit_chance = min(0.9, RPG_BASE_CRIT + aura_data.get("crit_bonus", 0.0) + trinket_bonus)
-    if random.random() < crit_chance:
+    if rpg_rng(rpg, "combat").random() < rpg_crit_chance(rpg):
         dmg = int(dmg * 1.75)
         rpg_log(f"Critical hit: {dmg} damage.")
     else:
@@ -8352,6 +8935,12 @@ def rpg_attack():
         enemy_turn(rpg)
 
 
+def rpg_crit_chance(rpg):
+    aura_data, _ = _active_aura_data(rpg)
+    trinket_bonus = (rpg.get("gear_trinket_bonus") or {}).get("crit_bonus", 0.0)
+    return min(0.9, RPG_BASE_CRIT + aura_data.get("crit_bonus", 0.0) + trinket_bonus)
+
+
 def complete_combat_victory(rpg, enemy):
     modifier = active_floor_modifier(rpg)
     gold_gain = int(enemy.get("gold", 0) * (1 + rpg.get("gold_bonus", 0.0)))
@@ -8402,7 +8991,7 @@ def enemy_turn(rpg):
         enemy["charging"] = False
         rpg_log(f"{enemy['name']} unleashes a charged strike for {dmg} damage!")
     else:
-        if random.random() < 0.2:
+        if rpg_rng(rpg, "combat").random() < 0.2:
             enemy["charging"] = True
             rpg_log(f"{enemy['name']} gathers static energy.")
             return
@@ -8420,6 +9009,90 @@ def enemy_turn(rpg):
         handle_rpg_death(rpg)
 
 
+_THREAT_ESTIMATES = {}
+_THREAT_PENDING = set()
+_THREAT_LOCK = threading.Lock()
+_THREAT_ESTIMATES_MAX = 8
+# Sized so one estimate takes a few milliseconds (NumPy evaluates roughly
+# half a million fights per second, the Python fallback far fewer).
+THREAT_ESTIMATE_TRIALS = 4000 if combat_odds.HAVE_NUMPY else 500
+
+
+def _fight_odds_args(rpg, enemy, potion_at=0.35):
+    aura_data, _ = _active_aura_data(rpg)
+    max_hp = rpg.get("max_hp", 1)
+    return {
+        "hp": rpg.get("hp", 0),
+        "max_hp": max_hp,
+        "atk": rpg.get("atk", RPG_PLAYER_START_ATK),
+        "enemy_hp": enemy.get("hp", 0),
+        "enemy_atk": enemy.get("atk", 1),
+        "defense": max(0, rpg.get("def", 0)),
+        "crit_chance": rpg_crit_chance(rpg),
+        "damage_reduction": int(aura_data.get("damage_reduction", 0)),
+        "potions": rpg["inventory"].get("potion", 0),
+        "potion_heal": max(10, int(max_hp * RPG_POTION_HEAL_RATIO)),
+        "potion_at": potion_at,
+        "charging": bool(enemy.get("charging", False)),
+    }
+
+
+def rpg_fight_odds(rpg, enemy=None, trials=None, seed=0, potion_at=0.35):
+    """Monte Carlo odds of winning ``enemy`` (default: the current one) from here."""
+    enemy = enemy or rpg.get("current_enemy")
+    if not enemy:
+        return None
+    return combat_odds.fight_odds(
+        **_fight_odds_args(rpg, enemy, potion_at),
+        trials=trials or THREAT_ESTIMATE_TRIALS,
+        seed=seed,
+    )
+
+
+def _threat_estimate_worker(key, args):
+    odds = combat_odds.fight_odds(**args, trials=THREAT_ESTIMATE_TRIALS, seed=0)
+    with _THREAT_LOCK:
+        _THREAT_PENDING.discard(key)
+        while len(_THREAT_ESTIMATES) >= _THREAT_ESTIMATES_MAX:
+            _THREAT_ESTIMATES.pop(next(iter(_THREAT_ESTIMATES)))
+        _THREAT_ESTIMATES[key] = odds
+
+
+def refresh_threat_estimate(rpg):
+    """Return the estimate for the current fight, starting a daemon thread if it is new.
+
+    The worker only sees a snapshot of the fight, so combat can move on
+    while it runs; a result for an outdated snapshot is simply never read.
+    """
+    enemy = rpg.get("current_enemy")
+    if HEADLESS or rpg.get("state") != "combat" or not enemy:
+        return None
+    if not game.get("settings", {}).get("rpg_threat_estimate"):
+        return None
+    args = _fight_odds_args(rpg, enemy)
+    key = tuple(sorted(args.items()))
+    with _THREAT_LOCK:
+        if key in _THREAT_ESTIMATES:
+            return _THREAT_ESTIMATES[key]
+        if key in _THREAT_PENDING:
+            return None
+        _THREAT_PENDING.add(key)
+    threading.Thread(target=_threat_estimate_worker, args=(key, args), daemon=True).start()
+    return None
+
+
+def threat_estimate_line(rpg):
+    odds = refresh_threat_estimate(rpg)
+    if not odds:
+        return "Threat: estimating..."
+    win = odds["win_rate"]
+    color = Fore.GREEN if win >= 0.8 else (Fore.YELLOW if win >= 0.5 else Fore.RED)
+    return (
+        f"Threat: {color}{win * 100:.0f}% win{Style.RESET_ALL}"
+        f"  ~{odds['hp_loss']:.0f} HP lost  ~{odds['potions']:.1f} potions"
+    )
+
+
 def handle_boss_defeat(rpg, room, enemy):
     floor = rpg.get("floor", 1)
     boss_data = RPG_BOSSES.get(floor)
@@ -8475,6 +9148,8 @@ def handle_rpg_death(rpg):
 
 
 def show_rpg_death_screen(rpg, gold_before, ng_gain, token_gain, token_total):
+    if HEADLESS:
+        return
     future_cycles = rpg.get("ng_plus", 0) + ng_gain
     future_hp = _rpg_base_hp_for_cycles(future_cycles)
     future_atk = _rpg_base_atk_for_cycles(future_cycles)
@@ -8547,7 +9222,7 @@ def rpg_attempt_flee():
     if rpg.get("state") != "combat":
         rpg_log("No combat to flee from.")
         return
-    if random.random() < 0.55:
+    if rpg_rng(rpg, "combat").random() < 0.55:
         rpg["state"] = "secret" if rpg.get("secret_origin") else "explore"
         rpg["current_enemy"] = None
         _clear_enemy_animation(rpg)
@@ -8558,7 +9233,8 @@ def rpg_attempt_flee():
 
 
 def rpg_grant_treasure(rpg):
-    roll = random.random()
+    rng = rpg_rng(rpg, "loot")
+    roll = rng.random()
     modifier = active_floor_modifier(rpg)
     potion_mult = modifier.get("potion_drop_mult", 1.0) if modifier else 1.0
     potion_threshold = max(0.05, min(0.85, 0.35 * potion_mult))
@@ -8567,7 +9243,7 @@ def rpg_grant_treasure(rpg):
         rpg["inventory"]["potion"] = rpg["inventory"].get("potion", 0) + 1
         rpg_log("Potion acquired.")
     elif roll < stat_threshold:
-        if random.random() < 0.5:
+        if rng.random() < 0.5:
             rpg["atk"] += 2
             rpg_log("Permanent bonus: +2 ATK.")
         else:
@@ -8588,7 +9264,7 @@ def grant_rpg_relic(rpg):
         rpg["gold"] += fallback
         rpg_log(f"The vault echoes and spills {fallback} gold instead.")
         return
-    relic = random.choice(available)
+    relic = rpg_rng(rpg, "loot").choice(available)
     start_relic_event(rpg, relic)
 
 
@@ -8679,6 +9355,7 @@ def rpg_handle_command(k):
             attempt_enter_hidden_room()
         elif k == "c":
             attempt_climb_stairs(rpg)
+    refresh_threat_estimate(rpg)
 
 
 def _desktop_icon_count():
@@ -9060,7 +9737,7 @@ def _shop_inventory_for_floor(rpg):
     for item in RPG_SHOP_STOCK:
         if floor >= item.get("floor_req", 1) and item.get("id") not in owned:
             eligible.append(copy.deepcopy(item))
-    random.shuffle(eligible)
+    rpg_rng(rpg, "loot").shuffle(eligible)
     limit = min(len(eligible), SHOP_MAX_ITEMS_PER_VISIT)
     return eligible[:limit]
 
@@ -9293,19 +9970,20 @@ def equip_rpg_trinket(rpg, item):
 def apply_shop_boon(rpg, item):
     floor = max(1, rpg.get("floor", 1))
     name = item.get("name", "Boon")
+    rng = rpg_rng(rpg, "loot")
 
     def _heal():
-        heal = max(20, int(rpg.get("max_hp", 1) * random.uniform(0.25, 0.45)))
+        heal = max(20, int(rpg.get("max_hp", 1) * rng.uniform(0.25, 0.45)))
         rpg["hp"] = min(rpg.get("max_hp", 1), rpg.get("hp", 1) + heal)
         return f"+{heal} HP"
 
     def _gold():
-        gold_gain = random.randint(70, 140) + floor * 15
+        gold_gain = rng.randint(70, 140) + floor * 15
         rpg["gold"] = rpg.get("gold", 0) + gold_gain
         return f"+{gold_gain} gold"
 
     def _xp():
-        xp_gain = random.randint(60, 140) + floor * 8
+        xp_gain = rng.randint(60, 140) + floor * 8
         rpg["xp"] = rpg.get("xp", 0) + xp_gain
         check_rpg_level_up(rpg)
         return f"+{xp_gain} XP"
@@ -9316,18 +9994,18 @@ def apply_shop_boon(rpg, item):
         return "+1 potion"
 
     def _aura():
-        aura_id = random.choice(list(RPG_AURAS.keys()))
+        aura_id = rng.choice(list(RPG_AURAS.keys()))
         set_rpg_aura(rpg, aura_id, source=name)
         label = RPG_AURAS.get(aura_id, {}).get("label", aura_id.title())
         return f"Aura set to {label}"
 
     def _tokens():
-        gain = random.randint(1, 3)
+        gain = rng.randint(1, 3)
         game["browser_tokens"] = game.get("browser_tokens", 0) + gain
         plural = "s" if gain != 1 else ""
         return f"+{gain} cache shard{plural}"
 
-    effect = random.choice([_heal, _gold, _xp, _potion, _aura, _tokens])
+    effect = rng.choice([_heal, _gold, _xp, _potion, _aura, _tokens])
     message = effect()
     rpg_log(f"{name}: {message}.")
 
@@ -9390,6 +10068,8 @@ def build_rpg_game_view(rpg, width, max_lines):
             encounter_body.append("")
         status = "Status: Charging" if enemy.get("charging") else "Status: Tracking"
         encounter_body.append(status)
+        if game.get("settings", {}).get("rpg_threat_estimate"):
+            encounter_body.append(threat_estimate_line(rpg))
     elif state == "shop":
         encounter_body = [
             "Shop interface active.",
@@ -9586,11 +10266,7 @@ def render_rpg_screen():
         sys.stdout.write("\033[2J\033[H")
         last_size = current_size
         last_render = ""
-    frame = "\033[H" + "\n".join(prepared)
-    if frame != last_render:
-        sys.stdout.write(frame)
-        sys.stdout.flush()
-        last_render = frame
+    present_frame(prepared)
 
 def main_loop():
     global KEY_PRESSED, running, work_timer, last_tick_time, last_manual_time, last_render
@@ -9617,6 +10293,13 @@ def main_loop():
         pass
     last_tick_time = time.time()
     threading.Thread(target=key_listener, daemon=True).start()
+    offline_summary = apply_offline_progress()
+    if offline_summary:
+        show_offline_progress_summary(offline_summary)
+        save_game()
+        if offline_summary.get("collapsed") and not game.get("wake_timer_infinite", False):
+            open_wake_timer_menu(auto_invoked=True)
+        last_tick_time = time.time()
 
     if not game.get("intro_played", False):
         set_settings_notice("Console boot complete.", duration=3.0)
@@ -9626,17 +10309,34 @@ def main_loop():
     if game.get("inspiration_resets", 0) > 0 and not game.get("inspiration_unlocked", False):
         game["inspiration_unlocked"] = True
         save_game()
+    FRAME_PROFILER.set_enabled(game.get("settings", {}).get("frame_profiler", False))
     current_screen = "work"
     global view_offset_x, view_offset_y
+    sim_dt = 1.0 / max(1.0, float(SIM_TICK_RATE))
+    render_interval = 1.0 / max(1.0, float(RENDER_FPS_CAP))
+    next_render_time = 0.0
+    render_requested = True
     try:
         while running:
             loop_start = time.time()
+            FRAME_PROFILER.begin_frame()
             try:
-                work_tick()
-                update_resonance(0.05)
-                rpg_state = game.get("rpg_data")
-                if isinstance(rpg_state, dict):
-                    tick_rpg_state(rpg_state)
+                with FRAME_PROFILER.phase("input"):
+                    pump_key_queue()
+                with FRAME_PROFILER.phase("sim"):
+                    # last_tick_time is the simulation clock; menus that call
+                    # work_tick() themselves advance it to wall time directly.
+                    steps = 0
+                    while loop_start - last_tick_time >= sim_dt and steps < SIM_MAX_CATCHUP_STEPS:
+                        work_tick(sim_dt)
+                        steps += 1
+                    if loop_start - last_tick_time >= sim_dt:
+                        # Too far behind to catch up step by step; credit the rest
+                        # in one coarse step so economy timing stays wall-clock true.
+                        work_tick()
+                    rpg_state = game.get("rpg_data")
+                    if isinstance(rpg_state, MutableMapping):
+                        tick_rpg_state(rpg_state)
 
                 if not game.get("mystery_revealed", False) and game.get("money_since_reset", 0) >= 100:
                     game["mystery_revealed"] = True
@@ -9646,12 +10346,17 @@ def main_loop():
                     save_game()
                     last_render = ""
 
-                if current_screen == "rpg":
-                    render_rpg_screen()
-                else:
-                    render_ui(screen=current_screen)
-                
+                if render_requested or loop_start >= next_render_time or not last_render:
+                    with FRAME_PROFILER.phase("render"):
+                        if current_screen == "rpg":
+                            render_rpg_screen()
+                        else:
+                            render_ui(screen=current_screen)
+                    next_render_time = loop_start + render_interval
+                    render_requested = False
+
                 if KEY_PRESSED:
+                    render_requested = True
                     k_raw = KEY_PRESSED
                     KEY_PRESSED = None
                     k = None
@@ -9726,6 +10431,7 @@ def main_loop():
                         clear_screen()
                         last_render = ""
                         save_game()
+                        flush_save()
                         running = False
                         break
                     elif current_screen == "rpg":
@@ -9928,6 +10634,7 @@ def main_loop():
                                 buy_tree_upgrade(AUTOMATION_UPGRADES, idx)
                             time.sleep(0.2)
             finally:
+                FRAME_PROFILER.end_frame()
                 loop_elapsed = time.time() - loop_start
                 if loop_elapsed < MAIN_LOOP_MIN_DT:
                     time.sleep(MAIN_LOOP_MIN_DT - loop_elapsed)
@@ -9936,9 +10643,201 @@ def main_loop():
         running = False
     finally:
         save_game()
+        flush_save()
+        if FRAME_PROFILER.enabled:
+            FRAME_PROFILER.dump(os.path.join(DATA_DIR, "frame_profile.json"))
+
+
+# --- Headless simulation ---
+SIMULATION_POLICIES = ("idle", "greedy")
+HEADLESS_MANUAL_GAP = 0.1  # matches the manual work throttle in main_loop
+
+
+def _headless_desk_candidates():
+    if not game.upgrades_unlocked:
+        return []
+    owned_items = game.owned
+    levels = game.upgrade_levels
+    money = game.money
+    candidates = []
+    for u in config.UPGRADES:
+        if not upgrade_is_visible(u):
+            continue
+        deps = config.UPGRADE_DEPENDENCIES.get(u["id"], [])
+        if not (u.get("unlocked", False) or all(dep in owned_items for dep in deps)):
+            continue
+        level = levels.get(u["id"], 0)
+        if level >= u.get("max_level", 1):
+            continue
+        cost = int(u["cost"] * (u.get("cost_mult", 1) ** level))
+        if cost <= money:
+            candidates.append((cost, u))
+    return candidates
+
+
+def _headless_buy_upgrades():
+    bought = 0
+    while True:
+        candidates = _headless_desk_candidates()
+        if not candidates:
+            break
+        _, cheapest = min(candidates, key=lambda pair: pair[0])
+        if not purchase_idx_upgrade(cheapest)[0]:
+            break
+        bought += 1
+    while True:
+        levels = get_wake_upgrade_levels()
+        options = []
+        for upg in WAKE_TIMER_UPGRADES:
+            level = levels.get(upg["id"], 0)
+            max_level = upg.get("max_level")
+            if max_level and level >= max_level:
+                continue
+            cost = wake_upgrade_cost(upg, level)
+            if cost <= game.stability_currency:
+                options.append((cost, upg))
+        if not options:
+            break
+        buy_wake_timer_upgrade(min(options, key=lambda pair: pair[0])[1])
+        bought += 1
+    trees = []
+    if game.get("inspiration_unlocked", False):
+        trees.append(INSPIRE_UPGRADES)
+    if game.get("concepts_unlocked", False):
+        trees.append(CONCEPT_UPGRADES)
+    if automation_lab_available():
+        trees.append(AUTOMATION_UPGRADES)
+    for upgrades in trees:
+        for idx in range(len(upgrades)):
+            while buy_tree_upgrade(upgrades, idx, auto=True, save=False):
+                bought += 1
+    return bought
+
+
+def _headless_manual_work(presses):
+    if presses <= 0 or wake_timer_blocked():
+        return 0
+    mark_known("ui_work_prompt")
+    return perform_work_batch(presses, 0.0, auto=False)
+
+
+def _format_sim_row(sim_time, purchases):
+    gain, eff_delay = compute_gain_and_delay(auto=auto_work_allowed())
+    wake = "inf" if game.get("wake_timer_infinite", False) else format_clock(game.get("wake_timer", 0))
+    return (
+        f"{format_duration(sim_time):>10} | money {format_number(game.get('money', 0)):>10}"
+        f" | run {format_number(game.get('money_since_reset', 0)):>10}"
+        f" | {STABILITY_CURRENCY_NAME} {format_number(game.get('stability_currency', 0)):>8}"
+        f" | collapses {game.get('stability_resets', 0):>5}"
+        f" | wake {wake:>6} | {format_number(gain / max(eff_delay, 1e-9))}/s"
+        f" | buys {purchases}"
+    )
+
+
+def run_headless_simulation(seconds, policy="greedy", step=1.0, report_every=3600.0, out=None):
+    """Run the economy with no rendering, sleeps or saving.
+
+    ``policy`` is ``idle`` (automation only) or ``greedy`` (also holds W and
+    buys the cheapest affordable upgrade whenever possible).
+    """
+    global SAVES_ENABLED, work_timer
+    out = out or sys.stdout
+    SAVES_ENABLED = False
+    step = max(0.01, float(step))
+    greedy = policy == "greedy"
+    elapsed = 0.0
+    manual_clock = 0.0
+    purchases = 0
+    next_report = 0.0
+    started = time.perf_counter()
+    while elapsed < seconds:
+        dt = min(step, seconds - elapsed)
+        if not game.get("wake_timer_infinite", False):
+            timer = game.get("wake_timer", WAKE_TIMER_START)
+            if timer > 0:
+                dt = min(dt, timer)
+        game["play_time"] = game.get("play_time", 0.0) + dt
+        ensure_challenge_feature()
+        advance_economy(dt, interactive=False)
+        if greedy:
+            manual_clock += dt
+            presses = int(manual_clock / HEADLESS_MANUAL_GAP)
+            if presses:
+                manual_clock -= presses * HEADLESS_MANUAL_GAP
+                _headless_manual_work(presses)
+            purchases += _headless_buy_upgrades()
+        refresh_knowledge_flags()
+        elapsed += dt
+        if elapsed >= next_report or elapsed >= seconds:
+            out.write(_format_sim_row(elapsed, purchases) + "\n")
+            next_report += report_every
+    wall = time.perf_counter() - started
+    out.write(
+        f"Simulated {format_duration(elapsed)} in {wall:.2f}s "
+        f"({elapsed / max(wall, 1e-9):,.0f}x real time).\n"
+    )
+    return elapsed
+
+
+def parse_cli_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description=GAME_TITLE if isinstance(GAME_TITLE, str) else None)
+    parser.add_argument("--simulate", action="store_true", help="run the economy headless and exit")
+    parser.add_argument("--slot", type=int, default=None, help="save slot to load (1-%d)" % SAVE_SLOT_COUNT)
+    parser.add_argument("--seconds", type=float, default=3600.0, help="simulated seconds to run")
+    parser.add_argument("--policy", choices=SIMULATION_POLICIES, default="greedy")
+    parser.add_argument("--step", type=float, default=1.0, help="simulation step in seconds")
+    parser.add_argument("--report-every", type=float, default=3600.0, help="seconds between timeline rows")
+    parser.add_argument("--export-json", metavar="PATH", help="write the save slot as readable JSON and exit")
+    return parser.parse_args(argv)
+
+
+def run_export_cli(args):
+    global ACTIVE_SLOT_INDEX, SAVES_ENABLED
+    SAVES_ENABLED = False
+    if args.slot is not None:
+        ACTIVE_SLOT_INDEX = max(0, min(SAVE_SLOT_COUNT - 1, args.slot - 1))
+    source = current_save_path()
+    if not os.path.exists(source):
+        sys.stderr.write(f"No save found at {source}.\n")
+        return 1
+    try:
+        payload = save_codec.read_file(source)
+        save_codec.export_json(payload, args.export_json)
+    except (OSError, save_codec.SaveDecodeError) as exc:
+        sys.stderr.write(f"Export failed: {exc}\n")
+        return 1
+    sys.stdout.write(f"Exported {source} to {args.export_json}.\n")
+    return 0
+
+
+def run_simulation_cli(args):
+    global ACTIVE_SLOT_INDEX, SAVES_ENABLED, HEADLESS
+    SAVES_ENABLED = False
+    HEADLESS = True
+    if args.slot is not None:
+        ACTIVE_SLOT_INDEX = max(0, min(SAVE_SLOT_COUNT - 1, args.slot - 1))
+        load_game()
+    else:
+        game.clear()
+        game.update(default_game_state())
+        apply_inspiration_effects()
+    run_headless_simulation(
+        args.seconds,
+        policy=args.policy,
+        step=args.step,
+        report_every=args.report_every,
+    )
+    return 0
 
 
 if __name__ == "__main__":
+    cli_args = parse_cli_args()
+    if cli_args.export_json:
+        sys.exit(run_export_cli(cli_args))
+    if cli_args.simulate:
+        sys.exit(run_simulation_cli(cli_args))
     try:
         request_fullscreen()
         run_terminal_scale_calculator()
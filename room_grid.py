@@ -0,0 +1,148 @@
+"""Compact save encoding for RPG floor maps.
+
+In play a floor is a list of rows of room dicts, which every RPG action
+reads and mutates in place. Written out that way each cell repeats the
+same three or four keys, so saves store a grid instead: one character per
+room type, one integer bitset per flag, and a sparse table for the few
+cells that carry anything else (secret payloads, encounter markers).
+``unpack`` rebuilds the room dicts, so only the save boundary sees this.
+"""
+from __future__ import annotations
+
+GRID_VERSION = 1
+
+# Codes are part of the save format: append new types, never reorder.
+ROOM_CODES = {
+    "empty": ".",
+    "start": "S",
+    "enemy": "e",
+    "elite": "E",
+    "treasure": "t",
+    "healer": "h",
+    "trap": "x",
+    "boss": "B",
+    "stairs": ">",
+    "exit": "X",
+    "secret": "?",
+    "secret_vault": "v",
+    "secret_echo": "o",
+    "secret_sentinel": "s",
+    "secret_exit": "<",
+}
+ROOM_TYPES = {code: r_type for r_type, code in ROOM_CODES.items()}
+UNKNOWN_CODE = "*"
+FLAG_KEYS = ("visited", "cleared", "hidden", "annex")
+# Flags that every room carries. An explicit False on any other flag (a
+# revealed secret's ``hidden``) goes to the sparse table to round-trip exactly.
+ALWAYS_FLAGS = ("visited", "cleared")
+
+
+def is_packed(value) -> bool:
+    return isinstance(value, dict) and "grid" in value and "types" in value
+
+
+def pack(layout):
+    """Return the grid form of ``layout``; non-grid values pass through."""
+    if not isinstance(layout, list) or not layout or not isinstance(layout[0], list):
+        return layout
+    width = len(layout[0])
+    if not width or any(len(row) != width for row in layout):
+        return layout
+    codes = []
+    bits = dict.fromkeys(FLAG_KEYS, 0)
+    extra = {}
+    idx = 0
+    for row in layout:
+        for room in row:
+            if not isinstance(room, dict):
+                return layout
+            r_type = room.get("type")
+            code = ROOM_CODES.get(r_type)
+            leftovers = None
+            if code is None:
+                code = UNKNOWN_CODE
+                leftovers = {"type": r_type}
+            codes.append(code)
+            bit = 1 << idx
+            for key, value in room.items():
+                if key == "type":
+                    continue
+                if key in bits and (value is True or (value is False and key in ALWAYS_FLAGS)):
+                    if value:
+                        bits[key] |= bit
+                    continue
+                if leftovers is None:
+                    leftovers = {}
+                leftovers[key] = value
+            if leftovers:
+                extra[str(idx)] = leftovers
+            idx += 1
+    packed = {"grid": GRID_VERSION, "w": width, "h": len(layout), "types": "".join(codes)}
+    for key in FLAG_KEYS:
+        if bits[key] or key in ALWAYS_FLAGS:
+            packed[key] = bits[key]
+    if extra:
+        packed["extra"] = extra
+    return packed
+
+
+def unpack(value):
+    """Inverse of :func:`pack`; lists and ``None`` pass through."""
+    if not is_packed(value):
+        return value
+    width = int(value.get("w", 0))
+    height = int(value.get("h", 0))
+    types = value.get("types", "")
+    extra = value.get("extra") or {}
+    flags = [(key, int(value.get(key, 0))) for key in FLAG_KEYS]
+    layout = []
+    idx = 0
+    for _ in range(height):
+        row = []
+        for _ in range(width):
+            code = types[idx] if idx < len(types) else "."
+            room = {"type": ROOM_TYPES.get(code, "empty")}
+            bit = 1 << idx
+            for key, mask in flags:
+                if mask & bit or key in ALWAYS_FLAGS:
+                    room[key] = bool(mask & bit)
+            leftovers = extra.get(str(idx))
+            if leftovers:
+                room.update(leftovers)
+            row.append(room)
+            idx += 1
+        layout.append(row)
+    return layout
+
+
+def pack_origin(origin):
+    """Pack the main-maze snapshot kept while the player is in a secret annex.
+
+    ``seam_room`` is the live cell at ``seam_coords`` in that map; it is
+    dropped here and re-linked by :func:`unpack_origin` so exiting the
+    annex after a reload still updates the right cell.
+    """
+    if not isinstance(origin, dict) or not isinstance(origin.get("map"), list):
+        return origin
+    packed = dict(origin)
+    packed["map"] = pack(origin["map"])
+    if is_packed(packed["map"]) and packed.get("seam_room") is not None:
+        del packed["seam_room"]
+    return packed
+
+
+def unpack_origin(origin):
+    if not isinstance(origin, dict) or not is_packed(origin.get("map")):
+        return origin
+    origin = dict(origin)
+    layout = unpack(origin["map"])
+    origin["map"] = layout
+    if "seam_room" in origin:
+        return origin
+    coords = origin.get("seam_coords")
+    try:
+        y, x = coords
+        origin["seam_room"] = layout[y][x]
+    except (TypeError, ValueError, IndexError):
+        origin["seam_room"] = None
+    return origin
@@ -0,0 +1,392 @@
+"""Batch-play the RPG headless to balance floors, bosses and NG+.
+
+Each life is played by a scripted policy through the same command handlers
+the keyboard uses (moves, attack/potion/flee, campfires, relics, shops), so
+enemy scaling, floor modifiers and level-ups all come from the game code.
+Runs are seeded, spread over a process pool, and never touch save slots.
+
+    python rpg_sim.py --runs 2000
+    python rpg_sim.py --runs 500 --ng-plus 4 --loops 3 --policy rush
+    python rpg_sim.py --odds --level 6 --max-floor 12
+
+``--odds`` skips the runs and prints Monte Carlo win rates (combat_odds)
+for a full-HP character against every enemy, elite and boss per floor.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("COLUMNS", "200")
+os.environ.setdefault("LINES", "55")
+
+import main  # noqa: E402
+
+POLICIES = ("thorough", "rush")
+EXIT_TYPES = {"exit", "stairs", "boss"}
+MOVES = {(-1, 0): "w", (1, 0): "s", (0, -1): "a", (0, 1): "d"}
+POTION_HP_RATIO = 0.35
+FLEE_HP_RATIO = 0.15
+CAMPFIRE_HP_RATIO = 0.6
+SHOP_ATTEMPTS = 3
+
+
+def _init_worker():
+    main.SAVES_ENABLED = False
+    main.HEADLESS = True
+
+
+def total_xp(rpg):
+    level = rpg.get("level", 1)
+    return 120 * (level - 1) * level // 2 + rpg.get("xp", 0)
+
+
+class Pilot:
+    """Picks the next key for one life; mirrors a cautious human player."""
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.shop_attempts = 0
+        self.tried_seams = set()
+
+    def next_key(self, rpg):
+        state = rpg.get("state")
+        if state == "combat":
+            return self._combat_key(rpg)
+        if state == "event":
+            return self._event_key(rpg)
+        if state == "shop":
+            return self._shop_key(rpg)
+        self.shop_attempts = 0
+        return self._explore_key(rpg)
+
+    def _combat_key(self, rpg):
+        hp_ratio = rpg.get("hp", 0) / max(1, rpg.get("max_hp", 1))
+        potions = rpg["inventory"].get("potion", 0)
+        if hp_ratio <= POTION_HP_RATIO and potions > 0:
+            return "p"
+        enemy = rpg.get("current_enemy") or {}
+        if hp_ratio <= FLEE_HP_RATIO and not enemy.get("boss"):
+            return "f"
+        return "a"
+
+    def _event_key(self, rpg):
+        kind = (main._current_event(rpg) or {}).get("kind")
+        if kind == "campfire":
+            return "r" if rpg.get("hp", 0) < rpg.get("max_hp", 0) else "l"
+        if kind == "relic":
+            return "a"
+        if kind == "secret":
+            return "h"
+        return "q"
+
+    def _shop_key(self, rpg):
+        if rpg.get("shop_pending_item"):
+            return "y"
+        stock = rpg.get("shop_stock") or []
+        gold = rpg.get("gold", 0)
+        if self.policy == "thorough" and self.shop_attempts < SHOP_ATTEMPTS:
+            for idx, item in enumerate(stock[:9]):
+                if item.get("cost", 0) <= gold:
+                    self.shop_attempts += 1
+                    return str(idx + 1)
+        return "q"
+
+    def _explore_key(self, rpg):
+        layout = rpg.get("map") or []
+        pos = rpg.get("player_pos")
+        if not layout or not pos:
+            return None
+        y, x = pos
+        here = layout[y][x]
+        if rpg.get("state") == "secret":
+            if here.get("type") == "secret_exit" and not self._unvisited(layout):
+                return "c"
+            return self._step_toward(layout, pos, self._secret_targets(layout))
+        if self.policy == "thorough" and rpg.get("state") == "explore":
+            seams = main._adjacent_hidden_rooms(rpg)
+            if len(seams) == 1:
+                key = (rpg.get("floor"), seams[0][0], seams[0][1])
+                if key not in self.tried_seams:
+                    self.tried_seams.add(key)
+                    return "h"
+        hp_ratio = rpg.get("hp", 0) / max(1, rpg.get("max_hp", 1))
+        targets = []
+        if hp_ratio < CAMPFIRE_HP_RATIO:
+            targets = self._cells(layout, lambda room: room.get("type") == "healer" and not room.get("cleared"))
+        if not targets and self.policy == "thorough":
+            targets = self._unvisited(layout)
+        if not targets:
+            if here.get("type") in {"exit", "stairs"}:
+                return "c"
+            targets = self._cells(layout, lambda room: room.get("type") in EXIT_TYPES)
+        return self._step_toward(layout, pos, targets)
+
+    @staticmethod
+    def _cells(layout, accept):
+        return {
+            (y, x)
+            for y, row in enumerate(layout)
+            for x, room in enumerate(row)
+            if accept(room)
+        }
+
+    def _unvisited(self, layout):
+        return self._cells(
+            layout,
+            lambda room: not room.get("visited")
+            and not room.get("hidden")
+            and room.get("type") not in EXIT_TYPES | {"secret_exit"},
+        )
+
+    def _secret_targets(self, layout):
+        return self._unvisited(layout) or self._cells(
+            layout, lambda room: room.get("type") == "secret_exit"
+        )
+
+    @staticmethod
+    def _step_toward(layout, pos, targets):
+        """First move of a shortest path to the nearest target (BFS)."""
+        start = tuple(pos)
+        targets = set(targets) - {start}
+        if not targets:
+            return None
+        height, width = len(layout), len(layout[0])
+        first = {start: None}
+        queue = deque([start])
+        while queue:
+            cy, cx = queue.popleft()
+            for (dy, dx), key in MOVES.items():
+                ny, nx = cy + dy, cx + dx
+                if not (0 <= ny < height and 0 <= nx < width) or (ny, nx) in first:
+                    continue
+                room = layout[ny][nx]
+                if room.get("hidden") and not room.get("visited"):
+                    continue
+                first[(ny, nx)] = first[(cy, cx)] or key
+                if (ny, nx) in targets:
+                    return first[(ny, nx)]
+                queue.append((ny, nx))
+        return None
+
+
+def play_life(rpg, pilot, max_floor, max_actions):
+    """Play until death, ``max_floor`` or ``max_actions``; return the life record."""
+    ng_plus = rpg.get("ng_plus", 0)
+    curve = [(rpg.get("floor", 1), rpg.get("gold", 0), total_xp(rpg))]
+    outcome = "stalled"
+    gold_before = rpg.get("gold", 0)
+    floor_before = rpg.get("floor", 1)
+    for _ in range(max_actions):
+        if rpg.get("state") == "transition":
+            main.complete_maze_reassembly(rpg)
+            continue
+        key = pilot.next_key(rpg)
+        if key is None:
+            break
+        gold_before = rpg.get("gold", 0)
+        floor_before = rpg.get("floor", 1)
+        main.rpg_handle_command(key)
+        if rpg.get("ng_plus", 0) != ng_plus:
+            outcome = "died"
+            break
+        floor = rpg.get("floor", 1)
+        if floor != floor_before:
+            curve.append((floor, rpg.get("gold", 0), total_xp(rpg)))
+            if floor >= max_floor:
+                outcome = "capped"
+                break
+    return {
+        "ng_plus": ng_plus,
+        "outcome": outcome,
+        "floor": floor_before if outcome == "died" else rpg.get("floor", 1),
+        "gold": gold_before if outcome == "died" else rpg.get("gold", 0),
+        "ng_gain": rpg.get("ng_plus", 0) - ng_plus if outcome == "died" else None,
+        "curve": curve,
+    }
+
+
+def run_seed(seed, policy="thorough", ng_plus=0, loops=1, max_floor=30, max_actions=20000):
+    """One seeded run of ``loops`` consecutive lives; returns their records."""
+    rpg = fresh_rpg(ng_plus, seed=seed)
+    lives = []
+    for _ in range(max(1, loops)):
+        life = play_life(rpg, Pilot(policy), max_floor, max_actions)
+        life["seed"] = seed
+        lives.append(life)
+        if life["outcome"] != "died":
+            break
+    return lives
+
+
+def _run_batch(seeds, options):
+    _init_worker()
+    lives = []
+    for seed in seeds:
+        lives.extend(run_seed(seed, **options))
+    return lives
+
+
+def simulate(runs, workers=None, seed=0, **options):
+    seeds = [seed + idx for idx in range(runs)]
+    workers = max(1, workers or os.cpu_count() or 1)
+    if workers == 1 or runs < 2:
+        return _run_batch(seeds, options)
+    chunk = max(1, -(-runs // (workers * 4)))
+    batches = [seeds[i : i + chunk] for i in range(0, runs, chunk)]
+    lives = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        for result in pool.map(_run_batch, batches, [options] * len(batches)):
+            lives.extend(result)
+    return lives
+
+
+def fresh_rpg(ng_plus=0, level=1, seed=0):
+    main.game.clear()
+    main.game.update(main.default_game_state())
+    rpg_data = main.default_rpg_data()
+    rpg_data["seed"] = seed
+    rpg_data["ng_plus"] = ng_plus
+    main.game["rpg_data"] = rpg_data
+    rpg = main.ensure_rpg_state()
+    while rpg["level"] < level:
+        rpg["xp"] = rpg["level"] * 120
+        main.check_rpg_level_up(rpg)
+    rpg["hp"] = rpg["max_hp"]
+    return rpg
+
+
+def odds_table(ng_plus=0, level=1, max_floor=15, trials=100000):
+    """Win odds per floor for each matchup, without floor modifiers."""
+    rpg = fresh_rpg(ng_plus, level)
+    rpg["floor_modifier"] = None
+    rows = []
+    for floor in range(1, max_floor + 1):
+        rpg["floor"] = floor
+        pool = [
+            entry
+            for entry in main.RPG_ENEMIES
+            if entry.get("min_floor", 1) <= floor <= entry.get("max_floor", main.RPG_FLOOR_CAP)
+        ]
+        enemies = [main.scale_rpg_enemy(entry, floor, rpg=rpg) for entry in pool]
+        enemies += [main.scale_rpg_enemy(entry, floor, elite=True, rpg=rpg) for entry in pool]
+        if main.RPG_BOSSES.get(floor):
+            enemies.append(main.build_rpg_boss(floor, rpg))
+        for enemy in enemies:
+            kind = "boss" if enemy.get("boss") else ("elite" if enemy.get("elite") else "")
+            odds = main.rpg_fight_odds(rpg, enemy, trials=trials, seed=floor)
+            rows.append((floor, enemy["name"], kind, enemy, odds))
+    return rpg, rows
+
+
+def format_odds(rpg, rows, out=sys.stdout):
+    backend = "numpy" if main.combat_odds.HAVE_NUMPY else "pure Python"
+    out.write(
+        f"Level {rpg['level']} NG+{rpg.get('ng_plus', 0)}: HP {rpg['max_hp']} ATK {rpg['atk']}"
+        f" DEF {rpg.get('def', 0)} potions {rpg['inventory'].get('potion', 0)} ({backend})\n\n"
+    )
+    out.write(f"{'floor':>5} {'enemy':<24} {'kind':<5} {'hp':>6} {'atk':>5} {'win %':>7} {'hp lost':>8} {'potions':>8} {'rounds':>7}\n")
+    for floor, name, kind, enemy, odds in rows:
+        out.write(
+            f"{floor:>5} {name:<24} {kind:<5} {enemy['hp']:>6} {enemy['atk']:>5}"
+            f" {odds['win_rate'] * 100:>6.1f}% {odds['hp_loss']:>8.1f} {odds['potions']:>8.2f} {odds['rounds']:>7.1f}\n"
+        )
+
+
+def summarize(lives):
+    deaths = Counter()
+    ng_gains = Counter()
+    outcomes = Counter()
+    curve = defaultdict(lambda: [0, 0, 0])
+    by_ng = defaultdict(lambda: [0, 0])
+    for life in lives:
+        outcomes[life["outcome"]] += 1
+        by_ng[life["ng_plus"]][0] += 1
+        by_ng[life["ng_plus"]][1] += life["floor"]
+        if life["outcome"] == "died":
+            deaths[life["floor"]] += 1
+            ng_gains[life["ng_gain"]] += 1
+        for floor, gold, xp in life["curve"]:
+            entry = curve[floor]
+            entry[0] += 1
+            entry[1] += gold
+            entry[2] += xp
+    return {
+        "lives": len(lives),
+        "outcomes": dict(outcomes),
+        "death_floors": dict(sorted(deaths.items())),
+        "ng_gains": dict(sorted(ng_gains.items())),
+        "by_ng_plus": {ng: {"lives": n, "mean_floor": total / n} for ng, (n, total) in sorted(by_ng.items())},
+        "curve": {
+            floor: {"reached": n, "mean_gold": gold / n, "mean_xp": xp / n}
+            for floor, (n, gold, xp) in sorted(curve.items())
+        },
+    }
+
+
+def format_report(summary, out=sys.stdout):
+    lives = max(1, summary["lives"])
+    outcomes = ", ".join(f"{name} {count}" for name, count in sorted(summary["outcomes"].items()))
+    out.write(f"{summary['lives']} lives: {outcomes}\n\n")
+    out.write(f"{'floor':>5} {'reached':>8} {'died':>6} {'died %':>7} {'mean gold':>10} {'mean xp':>9}\n")
+    for floor, row in summary["curve"].items():
+        died = summary["death_floors"].get(floor, 0)
+        out.write(
+            f"{floor:>5} {row['reached']:>8} {died:>6} {died * 100.0 / lives:>6.1f}%"
+            f" {row['mean_gold']:>10.0f} {row['mean_xp']:>9.0f}\n"
+        )
+    if len(summary["by_ng_plus"]) > 1:
+        out.write("\nFinal floor by starting NG+:\n")
+        for ng, row in summary["by_ng_plus"].items():
+            out.write(f"  NG+{ng:<3} {row['lives']:>6} lives, mean floor {row['mean_floor']:.2f}\n")
+    if summary["ng_gains"]:
+        out.write("\nNG+ gain at death (calculate_ng_gain_from_gold):\n")
+        for gain, count in summary["ng_gains"].items():
+            out.write(f"  +{gain:<3} {count:>6} ({count * 100.0 / lives:.1f}%)\n")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first run")
+    parser.add_argument("--policy", choices=POLICIES, default="thorough")
+    parser.add_argument("--ng-plus", type=int, default=0, help="NG+ cycle each run starts at")
+    parser.add_argument("--loops", type=int, default=1, help="consecutive lives per run")
+    parser.add_argument("--max-floor", type=int, default=30)
+    parser.add_argument("--max-actions", type=int, default=20000, help="per life")
+    parser.add_argument("--odds", action="store_true", help="print per-floor fight odds and exit")
+    parser.add_argument("--level", type=int, default=1, help="character level for --odds")
+    parser.add_argument("--trials", type=int, default=100000, help="fights per matchup for --odds")
+    return parser.parse_args(argv)
+
+
+def main_cli(argv=None):
+    args = parse_args(argv)
+    started = time.perf_counter()
+    if args.odds:
+        _init_worker()
+        format_odds(*odds_table(args.ng_plus, args.level, args.max_floor, args.trials))
+        sys.stdout.write(f"\nOdds in {time.perf_counter() - started:.1f}s.\n")
+        return 0
+    lives = simulate(
+        args.runs,
+        workers=args.workers,
+        seed=args.seed,
+        policy=args.policy,
+        ng_plus=args.ng_plus,
+        loops=args.loops,
+        max_floor=args.max_floor,
+        max_actions=args.max_actions,
+    )
+    format_report(summarize(lives))
+    sys.stdout.write(f"\n{args.runs} runs in {time.perf_counter() - started:.1f}s.\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,84 @@
+"""On-disk encodings for save slots.
+
+``json`` is the original readable format and the default. ``packed`` is a
+short magic header followed by zlib-compressed compact JSON. The nested
+records repeat the same keys over and over, so a late-game slot shrinks to
+under half of its JSON size, at the price of a little extra time for the
+compression. Packed slots use their own file extension; decoding sniffs
+the header anyway, so a slot can switch formats between saves and files
+under the other name keep loading.
+"""
+from __future__ import annotations
+
+import json
+import zlib
+
+import bignum
+
+FORMAT_JSON = "json"
+FORMAT_PACKED = "packed"
+FORMATS = (FORMAT_JSON, FORMAT_PACKED)
+DEFAULT_FORMAT = FORMAT_JSON
+EXTENSIONS = {FORMAT_JSON: ".json", FORMAT_PACKED: ".sav"}
+
+MAGIC = b"MWSV"
+CODEC_VERSION = 1
+# Level 1 is about twice as fast as the default and the slot barely grows.
+COMPRESS_LEVEL = 1
+_HEADER = MAGIC + bytes([CODEC_VERSION])
+_BIGNUM_TAG = bignum.JSON_TAG.encode("ascii")
+
+
+class SaveDecodeError(ValueError):
+    pass
+
+
+def normalize_format(fmt) -> str:
+    return fmt if fmt in FORMATS else DEFAULT_FORMAT
+
+
+def extension(fmt) -> str:
+    return EXTENSIONS[normalize_format(fmt)]
+
+
+def detect_format(data: bytes) -> str:
+    return FORMAT_PACKED if data[: len(MAGIC)] == MAGIC else FORMAT_JSON
+
+
+def encode(payload: dict, fmt: str = DEFAULT_FORMAT) -> bytes:
+    if normalize_format(fmt) == FORMAT_JSON:
+        return json.dumps(payload, default=bignum.json_default).encode("utf-8")
+    text = json.dumps(payload, default=bignum.json_default, separators=(",", ":"))
+    return _HEADER + zlib.compress(text.encode("utf-8"), COMPRESS_LEVEL)
+
+
+def decode(data: bytes) -> dict:
+    """Decode either format; raises SaveDecodeError on damaged input."""
+    if detect_format(data) == FORMAT_PACKED:
+        version = data[len(MAGIC)] if len(data) > len(MAGIC) else None
+        if version != CODEC_VERSION:
+            raise SaveDecodeError(f"unsupported packed save version {version!r}")
+        try:
+            data = zlib.decompress(data[len(_HEADER) :])
+        except zlib.error as exc:
+            raise SaveDecodeError(str(exc)) from exc
+    # The hook runs for every object, so skip it when no BigNum was saved.
+    hook = bignum.json_object_hook if _BIGNUM_TAG in data else None
+    try:
+        payload = json.loads(data, object_hook=hook)
+    except ValueError as exc:
+        raise SaveDecodeError(str(exc)) from exc
+    if not isinstance(payload, dict):
+        raise SaveDecodeError("save payload is not an object")
+    return payload
+
+
+def read_file(path: str) -> dict:
+    with open(path, "rb") as handle:
+        return decode(handle.read())
+
+
+def export_json(payload: dict, path: str) -> None:
+    """Write ``payload`` as indented JSON for inspection or hand edits."""
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2, default=bignum.json_default)
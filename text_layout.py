@@ -0,0 +1,173 @@
+"""ANSI-aware text measurement and layout helpers.
+
+Most panel text is identical from one frame to the next, so every helper
+here is memoized on its (text, width) arguments and per-character display
+widths are looked up in a table instead of asking wcwidth each time.
+"""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+try:
+    from wcwidth import wcswidth as _wcwidth
+except ImportError:
+    _wcwidth = None
+
+try:
+    from colorama import Style
+
+    RESET_SEQ = Style.RESET_ALL
+except ImportError:
+    RESET_SEQ = ""
+
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+LAYOUT_CACHE_SIZE = 8192
+
+_CHAR_WIDTHS: dict[str, int] = {}
+
+
+def char_width(ch: str) -> int:
+    width = _CHAR_WIDTHS.get(ch)
+    if width is None:
+        width = 1
+        if _wcwidth:
+            w = _wcwidth(ch)
+            if w is not None:
+                width = max(w, 0)
+        _CHAR_WIDTHS[ch] = width
+    return width
+
+
+def _plain_ascii(s: str) -> bool:
+    return s.isascii() and s.isprintable()
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _visible_len(s: str) -> int:
+    clean = ANSI_ESCAPE.sub("", s)
+    if _wcwidth:
+        return sum(char_width(c) for c in clean)
+    return len(clean)
+
+
+def visible_len(s: str) -> int:
+    if _plain_ascii(s) or (not _wcwidth and "\x1b" not in s):
+        return len(s)
+    return _visible_len(s)
+
+
+def ansi_center(text: str, width: int) -> str:
+    vis = visible_len(text)
+    pad_left = max(0, (width - vis) // 2)
+    pad_right = max(0, width - vis - pad_left)
+    return " " * pad_left + text + " " * pad_right
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def ansi_visible_slice(s: str, start: int, width: int) -> str:
+    if width <= 0:
+        return ""
+    if "\x1b" not in s:
+        return s[start : start + width]
+    out = []
+    esc_buf = []
+    vis = 0
+    end = start + width
+    i = 0
+    had_esc = False
+    while i < len(s):
+        ch = s[i]
+        if ch == "\x1b":
+            m = ANSI_ESCAPE.match(s, i)
+            if m:
+                seq = m.group(0)
+                esc_buf.append(seq)
+                had_esc = True
+                i += len(seq)
+                continue
+            else:
+                i += 1
+                continue
+        if vis >= start and vis < end:
+            if esc_buf:
+                out.extend(esc_buf)
+                esc_buf = []
+            out.append(ch)
+        vis += 1
+        i += 1
+        if vis >= end:
+            break
+    result = "".join(out)
+    if had_esc and result and RESET_SEQ and RESET_SEQ not in result:
+        result += RESET_SEQ
+    return result
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _wrap_visible_text(text: str, width: int) -> tuple[str, ...]:
+    segments = []
+    buffer = []
+    buffer_width = 0
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if ch == "\x1b":
+            match = ANSI_ESCAPE.match(text, i)
+            if match:
+                seq = match.group(0)
+                buffer.append(seq)
+                i += len(seq)
+                continue
+        if ch == "\n":
+            segments.append("".join(buffer))
+            buffer = []
+            buffer_width = 0
+            i += 1
+            continue
+        ch_width = char_width(ch)
+        if buffer_width and buffer_width + ch_width > width:
+            segments.append("".join(buffer))
+            buffer = []
+            buffer_width = 0
+            continue
+        buffer.append(ch)
+        buffer_width += ch_width
+        if buffer_width >= width:
+            segments.append("".join(buffer))
+            buffer = []
+            buffer_width = 0
+        i += 1
+    if buffer or not segments:
+        segments.append("".join(buffer))
+    return tuple(segments)
+
+
+def wrap_visible_text(text: str, width: int) -> list[str]:
+    if width <= 0:
+        return [text or ""]
+    if text is None:
+        return [""]
+    return list(_wrap_visible_text(text, width))
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _pad_visible_line(text: str, width: int) -> str:
+    snippet = ansi_visible_slice(text, 0, width)
+    vis = visible_len(snippet)
+    if vis < width:
+        snippet += " " * (width - vis)
+    return snippet
+
+
+def pad_visible_line(text, width):
+    if width <= 0:
+        return ""
+    return _pad_visible_line(text or "", width)
+
+
+def clear_layout_caches():
+    _visible_len.cache_clear()
+    ansi_visible_slice.cache_clear()
+    _wrap_visible_text.cache_clear()
+    _pad_visible_line.cache_clear()